@@ -3,36 +3,99 @@ from collections.abc import Generator, Iterator
 
 from edge import Edge
 from graph import Graph
+from union_find import UnionFind
 
 ## Graphにエイリアス機能を付けるラッパー。
 class AliasGraph:
     def __init__(self):
         self.graph = Graph()
         self.alias_map: dict[int, int] = dict()  # real -> aliasのマップ
+        self.alias_dict_cache: dict[int, set[int]] | None = None  # alias -> realのセットのマップ。alias_mapの変更で無効化する。
+        # 以下は辺の追加と削除で逐次更新する。Noneのときは未計算で、必要になった時点で計算する。
+        self.alias_degree: dict[int, int] | None = None  # エイリアスノード -> 次数
+        self.odd_nodes: set[int] | None = None  # 次数が奇数のエイリアスノード
+        self.connected: bool | None = None  # is_connected()の結果。辺の削除とエイリアスの変更で無効化する
 
     ## 辺を追加する。辺がNoneの場合は追加しない。
     #  新規のノードのエイリアス情報はリセットされる。
     #  @param edge 追加する辺。
-    def add_edge(self, edge: Edge) -> None:
+    #  @return 追加した辺のハンドル。辺がNoneの場合はNone。
+    def add_edge(self, edge: Edge) -> int | None:
         if edge is None:
-            return
+            return None
 
         n1 = edge.get_node1()
         n2 = edge.get_node2()
-        if not self.graph.contains_node(n1):
-            self.alias_map.pop(n1, None)
-        if not self.graph.contains_node(n2):
-            self.alias_map.pop(n2, None)
-        self.graph.add_edge(edge)
+        if not self.graph.contains_node(n1) and n1 in self.alias_map:
+            self.remove_alias(n1)
+        if not self.graph.contains_node(n2) and n2 in self.alias_map:
+            self.remove_alias(n2)
+        # 連結グラフに既存のノードから辺を足しても連結のまま。それ以外は調べ直す。
+        if self.connected is not None:
+            if not (self.connected and self.alias_degree is not None
+                    and (self.alias_map.get(n1, n1) in self.alias_degree or self.alias_map.get(n2, n2) in self.alias_degree)):
+                self.connected = None
+        handle = self.graph.add_edge(edge)
+        self.update_degree(edge, 1)
+        return handle
 
     ## 辺を削除する。
     #  @param edge 削除する辺。
     def remove_edge(self, edge: Edge) -> None:
         self.graph.remove_edge(edge)
+        self.update_degree(edge, -1)
+        self.connected = None
+
+    ## ハンドルで指定した辺を削除する。
+    #  @param handle 削除する辺のハンドル。
+    def remove_edge_by_handle(self, handle: int) -> None:
+        edge: Edge = self.graph.get_edge_by_handle(handle)
+        self.graph.remove_edge_by_handle(handle)
+        self.update_degree(edge, -1)
+        self.connected = None
+
+    ## 辺の追加または削除に合わせて、エイリアスノードの次数と奇数次数のノードを更新する。
+    #  @param edge  追加または削除した辺。
+    #  @param delta 追加のとき1、削除のとき-1。
+    def update_degree(self, edge: Edge, delta: int) -> None:
+        if self.alias_degree is None:
+            return
+        for n in (edge.get_node1(), edge.get_node2()):
+            alias: int = self.alias_map.get(n, n)
+            d: int = self.alias_degree.get(alias, 0) + delta
+            if d:
+                self.alias_degree[alias] = d
+            else:
+                del self.alias_degree[alias]
+            if d % 2:
+                self.odd_nodes.add(alias)
+            else:
+                self.odd_nodes.discard(alias)
+
+    ## エイリアスノードの次数と奇数次数のノードを無効化する。
+    def invalidate_degree(self) -> None:
+        self.alias_degree = None
+        self.odd_nodes = None
+        self.connected = None
+
+    ## 次数が奇数のエイリアスノードの集合を返す。
+    #  呼び出し側で変更しないこと。
+    #  @return 次数が奇数のエイリアスノードの集合。
+    def get_odd_node_set(self) -> set[int]:
+        if self.odd_nodes is None:
+            self.alias_degree = {n: d for n, d in self.get_degree_map().items() if d != 0}
+            self.odd_nodes = {n for n, d in self.alias_degree.items() if d % 2 != 0}
+        return self.odd_nodes
+
+    ## ハンドルで指定した辺を返す。
+    #  @param handle 辺のハンドル。
+    #  @return 指定されたハンドルの辺。
+    def get_edge_by_handle(self, handle: int) -> Edge:
+        return self.graph.get_edge_by_handle(handle)
 
     def remove_alias_key(self, n: int) -> None:
-        if not self.graph.contains_node(n):
-            self.alias_map.pop(n, None)
+        if not self.graph.contains_node(n) and n in self.alias_map:
+            self.remove_alias(n)
 
     ## ノードの一覧のコピーを返す。
     #  @return ノードの一覧のコピー。
@@ -113,10 +176,12 @@ class AliasGraph:
         alias_dict: dict[int, set[int]] = self.get_alias_dict()
         if node in alias_dict:
             edge_list = []
+            found: set[Edge] = set()
             for n in alias_dict[node]:
                 local_list = self.graph.get_edge_list_by_node(n, e_list)
-                local_list = [e for e in local_list if e not in edge_list]
+                local_list = [e for e in local_list if e not in found]
                 edge_list += local_list
+                found.update(local_list)
             return edge_list
 
         return self.graph.get_edge_list_by_node(node, e_list)
@@ -125,6 +190,8 @@ class AliasGraph:
     def clear(self) -> None:
         self.graph.clear()
         self.alias_map.clear()
+        self.alias_dict_cache = None
+        self.invalidate_degree()
 
     def __eq__(self, other):
         if (other is None) or (not isinstance(other, AliasGraph)):
@@ -151,6 +218,10 @@ class AliasGraph:
         new_graph = AliasGraph()
         new_graph.graph = Graph.copy_instance(g.graph)
         new_graph.alias_map = g.alias_map.copy()
+        if g.alias_degree is not None:
+            new_graph.alias_degree = g.alias_degree.copy()
+            new_graph.odd_nodes = g.odd_nodes.copy()
+        new_graph.connected = g.connected
         return new_graph
 
     ## グラフの包含を調べる。
@@ -217,24 +288,51 @@ class AliasGraph:
     #  @exception ValueError 同じノードに異なるエイリアスが設定されているとき。
     def merge_graph(self, graph: 'AliasGraph') -> None:
         self.graph.merge_graph(graph.graph)
+        self.invalidate_degree()
         for n in graph.alias_map:
             if n in self.alias_map:
                 if self.alias_map[n] != graph.alias_map[n]:
                     raise ValueError('マージするグラフに異なるエイリアスが設定されています')
             else:
                 self.alias_map[n] = graph.alias_map[n]
+                self.alias_dict_cache = None
 
     ## このグラフが連結グラフのときTrueを返す。空グラフのときはFalseを返す。
     #  @return このグラフが連結グラフのときTrue。空グラフのときはFalse。
     def is_connected(self) -> bool:
-        convert_graph = self.generate_alias_node_graph()
-        return convert_graph.is_connected()
+        if self.connected is None:
+            self.connected = not self.is_empty() and self.make_union_find().get_set_size() == 1
+        return self.connected
+
+    ## 連結成分のリストを返す。
+    #  @return エイリアスノードのリストのリスト。成分もノードも、ノードが辺に初めて現れた順。
+    def get_connected_components(self) -> list[list[int]]:
+        union_find: UnionFind = self.make_union_find()
+        components: dict[int, list[int]] = dict()  # 代表元 -> 連結成分
+        for n in union_find:
+            components.setdefault(union_find.find(n), []).append(n)
+        return list(components.values())
+
+    ## 辺の両端のエイリアスノードを併合したUnion-Findを返す。
+    #  @return エイリアスノードのUnion-Find。
+    def make_union_find(self) -> UnionFind:
+        union_find = UnionFind()
+        alias_map: dict[int, int] = self.alias_map
+        for edge in self.graph.edge_generator():
+            node1: int = edge.get_node1()
+            node2: int = edge.get_node2()
+            union_find.union(alias_map.get(node1, node1), alias_map.get(node2, node2))
+        return union_find
 
     ## このグラフがオイラーグラフかを返す。
     #  @return このグラフがオイラーグラフのときTrue。
+    #  次数と連結性は前回の結果を辺の追加と削除に合わせて更新したものを使う。
     def is_euler_graph(self) -> bool:
-        convert_graph = self.generate_alias_node_graph()
-        return convert_graph.is_euler_graph()
+        if self.is_empty():
+            return False
+        if self.get_odd_node_set():
+            return False
+        return self.is_connected()
 
     def generate_alias_node_graph(self) -> Graph:
         convert_graph = Graph()
@@ -286,6 +384,63 @@ class AliasGraph:
 
         return branch_graph
 
+    ## 枝線を再帰的に抜き出し、その枝線をこのグラフから削除する。
+    #  pick_up_branch_and_remove()を空のグラフが返るまで繰り返したときと同じ結果を、1回の走査で返す。
+    #  次数1のエイリアスノードの列を段ごとに処理し、削除した辺の端点の次数だけを更新する。
+    #  各段のノードの順序は、その時点のget_degree_map()と同じにする。
+    #  次数1のエイリアスノードでは辺を持つオリジナルノードは1つなので、その位置で並べる。
+    #  @return 段ごとの枝線の集合グラフのリスト。
+    def pick_up_branches_and_remove(self) -> list['AliasGraph']:
+        members: dict[int, list[int]] = dict()  # エイリアスノード -> オリジナルノードのリスト
+        for n in self.graph.get_degree_map():
+            members.setdefault(self.alias_map.get(n, n), []).append(n)
+        alias_degree: dict[int, int] = self.get_degree_map()
+
+        def leaf_position(alias: int) -> tuple[int, int]:
+            for n in members[alias]:
+                if self.graph.contains_node(n):
+                    return self.graph.get_node_position(n)
+            raise ValueError(f'AliasGraph: node {alias} has no edge.')
+
+        branch_list: list[AliasGraph] = []
+        leaves: list[int] = [n for n, d in alias_degree.items() if d == 1]
+        while leaves:
+            branch_graph = AliasGraph()
+            handles: list[int] = []
+            handle_set: set[int] = set()
+            for leaf in leaves:
+                for n in members[leaf]:
+                    leaf_handles: list[int] = self.graph.get_handle_list_by_node(n)
+                    if leaf_handles:
+                        # 両端が次数1の辺は1本だけ抜き出す。
+                        if leaf_handles[0] not in handle_set:
+                            handle_set.add(leaf_handles[0])
+                            handles.append(leaf_handles[0])
+                            branch_graph.add_edge(self.graph.get_edge_by_handle(leaf_handles[0]))
+                        break
+
+            for e in branch_graph.edge_generator():
+                node1: int = e.get_node1()
+                if node1 in self.alias_map:
+                    branch_graph.set_alias_node(node1, self.alias_map[node1])
+                node2: int = e.get_node2()
+                if node2 in self.alias_map:
+                    branch_graph.set_alias_node(node2, self.alias_map[node2])
+
+            touched: set[int] = set()
+            for handle in handles:
+                e = self.graph.get_edge_by_handle(handle)
+                self.remove_edge_by_handle(handle)
+                for n in (e.get_node1(), e.get_node2()):
+                    alias: int = self.alias_map.get(n, n)
+                    alias_degree[alias] -= 1
+                    touched.add(alias)
+
+            branch_list.append(branch_graph)
+            leaves = sorted((n for n in touched if alias_degree[n] == 1), key=leaf_position)
+
+        return branch_list
+
     ## ノードのエイリアスを返す。
     #  ノードが無いときはノードをそのまま返す。
     #  @param real ノード。
@@ -298,15 +453,30 @@ class AliasGraph:
         return self.alias_map[real]
 
     def set_alias_node(self, real: int, alias: int) -> None:
-        self.alias_map[real] = alias
+        if self.alias_map.get(real) != alias:
+            self.alias_map[real] = alias
+            self.alias_dict_cache = None
+            if self.graph.contains_node(real):
+                self.invalidate_degree()
+
+    ## ノードのエイリアス情報を削除する。
+    #  @param real ノード。
+    def remove_alias(self, real: int) -> None:
+        del self.alias_map[real]
+        self.alias_dict_cache = None
+        if self.graph.contains_node(real):
+            self.invalidate_degree()
 
     ## エイリアスの辞書を返す。
     #  キーがエイリアスで、値がそのエイリアスに対応するノードのセット。
+    #  エイリアス情報が変わるまでは同じ辞書を返すので、呼び出し側で変更しないこと。
     #  @return エイリアスの辞書。
     def get_alias_dict(self) -> dict[int, set[int]]:
-        alias_dict: dict[int, set[int]] = dict()
-        for k, v in self.alias_map.items():
-            if v not in alias_dict:
-                alias_dict[v] = set()
-            alias_dict[v].add(k)
-        return alias_dict
+        if self.alias_dict_cache is None:
+            alias_dict: dict[int, set[int]] = dict()
+            for k, v in self.alias_map.items():
+                if v not in alias_dict:
+                    alias_dict[v] = set()
+                alias_dict[v].add(k)
+            self.alias_dict_cache = alias_dict
+        return self.alias_dict_cache
@@ -4,6 +4,7 @@
 # This is a binary heap for pairs of the type (Decimal key, int satellite)
 # It is assumed that satellites are unique integers
 # This is the case with graph algorithms, in which satellites are vertex or edge indices
+# Keys only have to be comparable, Dijkstra uses (Decimal, sequence number) pairs to break ties
 
 from decimal import Decimal
 
@@ -63,9 +64,47 @@ class BinaryHeap:
         return min
     
     # Changes the key of the element with satellite s
+    # A decreased key is sifted up and an increased key is sifted down
+    # The element keeps its place among elements of equal key, so they may be popped in another order
+    # than after remove and insert
     def change_key(self, k: Decimal, s: int) -> None:
-        self.remove(s)
-        self.insert(k, s)
+        i = self.pos[s]
+        decreased = k < self.key[s]
+        self.key[s] = k
+        if decreased:
+            self.sift_up(i)
+        else:
+            self.sift_down(i)
+
+    # Moves the element at position i up until its parent key is not greater
+    def sift_up(self, i: int) -> None:
+        s = self.satellite[i]
+        k = self.key[s]
+        while i // 2 > 0 and self.key[self.satellite[i // 2]] > k:
+            self.satellite[i] = self.satellite[i // 2]
+            self.pos[self.satellite[i]] = i
+            i //= 2
+        self.satellite[i] = s
+        self.pos[s] = i
+
+    # Moves the element at position i down until no child key is smaller
+    def sift_down(self, i: int) -> None:
+        s = self.satellite[i]
+        k = self.key[s]
+        child = 2 * i
+        while child <= self.size:
+            if child < self.size and self.key[self.satellite[child]] > self.key[self.satellite[child + 1]]:
+                child += 1
+
+            if k > self.key[self.satellite[child]]:
+                self.satellite[i] = self.satellite[child]
+                self.pos[self.satellite[child]] = i
+            else:
+                break
+            i = child
+            child *= 2
+        self.satellite[i] = s
+        self.pos[s] = i
     
     # Removes the element with satellite s
     def remove(self, s: int) -> None:
@@ -4,13 +4,14 @@
 from decimal import Decimal
 from collections import deque
 from matching_graph import MatchingGraph
+from sparse_matching_graph import SparseMatchingGraph
 from binary_heap import BinaryHeap
 from e_blossom_type import EBlossomType
 
 class BlossomMatching:
-    # Parametric constructor receives a graph instance
-    def __init__(self, g: MatchingGraph):
-        self.g: MatchingGraph = g
+    # Parametric constructor receives a graph instance (dense MatchingGraph or SparseMatchingGraph)
+    def __init__(self, g: MatchingGraph | SparseMatchingGraph):
+        self.g: MatchingGraph | SparseMatchingGraph = g
         self.m: int = g.get_num_edges()
         self.n: int = g.get_num_vertices()
         data_size = 2 * self.n
@@ -23,13 +24,18 @@ class BlossomMatching:
         self.forest: list[int] = [0] * data_size  # forest[v] gives the father of v in the alternating forest
         self.root: list[int] = [0] * data_size  # root[v] gives the root of v in the alternating forest 
         self.blocked: list[bool] = [False] * data_size  # A blossom can be blocked due to dual costs, this means that it behaves as if it were an original vertex and cannot be expanded
-        self.dual: list[Decimal] = [Decimal(0)] * data_size  # dual multipliers associated to the blossoms, if dual[v] > 0, the blossom is blocked and full
-        self.slack: list[Decimal] = [Decimal(0)] * self.m  # slack associated to each edge, if slack[e] > 0, the edge cannot be used
+        self.zero: Decimal | int = Decimal(0)  # Zero of the cost type, 0 (int) in the fixed-point mode
+        self.dual: list[Decimal | int] = [self.zero] * data_size  # dual multipliers associated to the blossoms, if dual[v] > 0, the blossom is blocked and full
+        self.slack: list[Decimal | int] = [self.zero] * self.m  # slack associated to each edge, if slack[e] > 0, the edge cannot be used
         self.mate: list[int] = [0] * data_size  # mate[v] gives the mate of v
         self.visited: list[bool] = [False] * data_size
         self.free: deque[int] = deque()  # List of free blossom indices
         self.perfect: bool = False
         self.forest_list: deque[int] = deque()
+        self.cost_scale: int = 1  # Internal costs are the given costs times cost_scale plus cost_offset
+        self.cost_offset: Decimal | int = self.zero
+        self.final_dual: list[Decimal | int] = []  # dual multipliers of the last solution
+        self.vertex_blossoms: list[list[int]] = []  # vertex_blossoms[v] lists the blossoms with nonzero dual that contain v
     
     # Solves the minimum cost perfect matching problem
     # Receives the a vector whose position i has the cost of the edge with index i
@@ -37,7 +43,14 @@ class BlossomMatching:
     # Returns a tuple
     # the first element of the tuple is a list of the indices of the edges in the matching
     # the second is the cost of the matching
-    def solve_minimum_cost_perfect_matching(self, cost: list[Decimal]) -> tuple[list[int], Decimal]:
+    # If fixed_point is true, the costs are scaled to exact integers and the dual updates run on ints
+    # The matching is the same as the one found with Decimal costs
+    def solve_minimum_cost_perfect_matching(self, cost: list[Decimal], fixed_point: bool = False) -> tuple[list[int], Decimal]:
+        scale: int | None = BlossomMatching.get_cost_scale(cost) if fixed_point else None
+        scaled_cost: list[int] | None = None if scale is None else [int(c * scale) for c in cost]
+        self.zero = Decimal(0) if scaled_cost is None else 0
+        self.cost_scale = 1 if scale is None else scale
+
         self.solve_maximum_matching()
         if not self.perfect:
             raise ValueError('Error: The graph does not have a perfect matching')
@@ -45,7 +58,7 @@ class BlossomMatching:
         self.clear()
 
         # Initialize slacks (reduced costs for the edges)
-        self.slack = list(cost)
+        self.slack = list(cost) if scaled_cost is None else scaled_cost
 
         self.positive_costs()
 
@@ -60,6 +73,7 @@ class BlossomMatching:
             # Set up the algorithm for a new grow step
             self.reset()
 
+        self.save_dual_solution()
         matching: list[int] = self.retrieve_matching()
 
         obj: Decimal = Decimal(0)
@@ -317,31 +331,40 @@ class BlossomMatching:
 
         return t
 
+    # Only edges with a labeled (even or odd) endpoint can bound the dual step or change their slack,
+    # so both edge passes walk the adjacency of the vertices in the alternating forest instead of all m edges
+    # This is only a constant-factor pruning: an update still costs O(sum of the labeled degrees), which is O(m)
+    # on a complete graph. Slacks are stored per edge and grow() rebuilds the forest by scanning the same edges
+    # every round, so tracked minimum slacks would not make a round O(n) without reworking the solver
     def update_dual_costs(self) -> None:
-        e1: Decimal = Decimal(0)
-        e2: Decimal = Decimal(0)
-        e3: Decimal = Decimal(0)
+        e1: Decimal | int = self.zero
+        e2: Decimal | int = self.zero
+        e3: Decimal | int = self.zero
         inite1: bool = False
         inite2: bool = False
         inite3: bool = False
-        for i in range(self.m):
-            u: int = self.g.get_edge(i)[0]
-            v: int = self.g.get_edge(i)[1]
-
-            if (self.blossom_type[self.outer[u]] == EBlossomType.EVEN and self.blossom_type[self.outer[v]] == EBlossomType.UNLABELED) or \
-               (self.blossom_type[self.outer[v]] == EBlossomType.EVEN and self.blossom_type[self.outer[u]] == EBlossomType.UNLABELED):
-                if (not inite1) or e1 > self.slack[i]:
-                    e1 = self.slack[i]
-                    inite1 = True
-            elif self.outer[u] != self.outer[v] and self.blossom_type[self.outer[u]] == EBlossomType.EVEN and self.blossom_type[self.outer[v]] == EBlossomType.EVEN:
-                if (not inite2) or e2 > self.slack[i]:
-                    e2 = self.slack[i]
-                    inite2 = True
+        outer = self.outer
+        blossom_type = self.blossom_type
+        slack = self.slack
+        labeled: list[int] = [u for u in range(self.n) if blossom_type[outer[u]] != EBlossomType.UNLABELED]
+        for u in labeled:
+            if blossom_type[outer[u]] != EBlossomType.EVEN:
+                continue
+            for v, i in zip(self.g.get_adj_list(u), self.g.get_adj_edge_list(u)):
+                v_type: EBlossomType = blossom_type[outer[v]]
+                if v_type == EBlossomType.UNLABELED:
+                    if (not inite1) or e1 > slack[i]:
+                        e1 = slack[i]
+                        inite1 = True
+                elif outer[u] != outer[v] and v_type == EBlossomType.EVEN:
+                    if (not inite2) or e2 > slack[i]:
+                        e2 = slack[i]
+                        inite2 = True
         for i in range(self.n, 2 * self.n):
             if self.active[i] and i == self.outer[i] and self.blossom_type[self.outer[i]] == EBlossomType.ODD and (not inite3 or e3 > self.dual[i]):
                 e3 = self.dual[i]
                 inite3 = True
-        e: Decimal = Decimal(0)
+        e: Decimal | int = self.zero
         if inite1:
             e = e1
         elif inite2:
@@ -349,8 +372,11 @@ class BlossomMatching:
         elif inite3:
             e = e3
 
-        if e > e2 / 2 and inite2:
-            e = e2 / 2
+        if inite2:
+            # Integer slacks are doubled costs, so e2 is even in the fixed-point mode
+            half_e2 = e2 // 2 if isinstance(e2, int) else e2 / 2
+            if e > half_e2:
+                e = half_e2
         if e > e3 and inite3:
             e = e3
 
@@ -363,19 +389,24 @@ class BlossomMatching:
             elif self.active[i] and self.blossom_type[self.outer[i]] == EBlossomType.ODD:
                 self.dual[i] -= e
 
-        for i in range(self.m):
-            u: int = self.g.get_edge(i)[0]
-            v: int = self.g.get_edge(i)[1]
-
-            if self.outer[u] != self.outer[v]:
-                if self.blossom_type[self.outer[u]] == EBlossomType.EVEN and self.blossom_type[self.outer[v]] == EBlossomType.EVEN:
-                    self.slack[i] -= 2 * e
-                elif self.blossom_type[self.outer[u]] == EBlossomType.ODD and self.blossom_type[self.outer[v]] == EBlossomType.ODD:
-                    self.slack[i] += 2 * e
-                elif (self.blossom_type[self.outer[v]] == EBlossomType.UNLABELED and self.blossom_type[self.outer[u]] == EBlossomType.EVEN) or (self.blossom_type[self.outer[u]] == EBlossomType.UNLABELED and self.blossom_type[self.outer[v]] == EBlossomType.EVEN):
-                    self.slack[i] -= e
-                elif (self.blossom_type[self.outer[v]] == EBlossomType.UNLABELED and self.blossom_type[self.outer[u]] == EBlossomType.ODD) or (self.blossom_type[self.outer[u]] == EBlossomType.UNLABELED and self.blossom_type[self.outer[v]] == EBlossomType.ODD):
-                    self.slack[i] += e
+        for u in labeled:
+            u_type: EBlossomType = blossom_type[outer[u]]
+            for v, i in zip(self.g.get_adj_list(u), self.g.get_adj_edge_list(u)):
+                if outer[u] == outer[v]:
+                    continue
+                v_type: EBlossomType = blossom_type[outer[v]]
+                if v_type == EBlossomType.UNLABELED:
+                    if u_type == EBlossomType.EVEN:
+                        slack[i] -= e
+                    else:
+                        slack[i] += e
+                elif v < u:
+                    # Edges between two labeled vertices are updated once, from the smaller endpoint
+                    continue
+                elif u_type == EBlossomType.EVEN and v_type == EBlossomType.EVEN:
+                    slack[i] -= 2 * e
+                elif u_type == EBlossomType.ODD and v_type == EBlossomType.ODD:
+                    slack[i] += 2 * e
         for i in range(self.n, 2 * self.n):
             if self.dual[i] > 0:
                 self.blocked[i] = True
@@ -408,10 +439,10 @@ class BlossomMatching:
             self.root[i] = i
 
             self.blocked[i] = False
-            self.dual[i] = Decimal(0)
+            self.dual[i] = self.zero
             self.mate[i] = -1
             self.tip[i] = i
-        self.slack = [Decimal(0)] * self.m
+        self.slack = [self.zero] * self.m
 
     # Destroys a blossom recursively
     def destroy_blossom(self, t: int) -> None:
@@ -433,6 +464,7 @@ class BlossomMatching:
     # Uses an heuristic algorithm to find the maximum matching of the graph
     # Vertices will be selected in non-decreasing order of their degree
     # Each time an unmatched vertex is selected, it is matched to its adjacent unmatched vertex of minimum degree
+    # Vertices of equal degree are popped in BinaryHeap order, which decides the matching among equal-cost ones
     def heuristic(self) -> None:
         degree: list[int] = [0] * self.n
         b: BinaryHeap = BinaryHeap()
@@ -465,15 +497,59 @@ class BlossomMatching:
                     self.mate[self.outer[u]] = min
                     self.mate[self.outer[min]] = u
 
+    # Returns the factor that scales the costs to integers for the fixed-point mode
+    # The factor is 2 * 10^k, where k is the largest number of decimal places,
+    # so the costs are exact and the halving of the dual step stays integral
+    # Returns None if a cost is not finite
+    @staticmethod
+    def get_cost_scale(cost: list[Decimal]) -> int | None:
+        places: int = 0
+        for c in cost:
+            if not c.is_finite():
+                return None
+            places = max(places, -c.as_tuple().exponent)
+
+        return 2 * 10 ** places
+
+    # Keeps the dual multipliers of the optimal solution and the blossoms that contain each vertex
+    def save_dual_solution(self) -> None:
+        self.final_dual = list(self.dual)
+        self.vertex_blossoms = [[] for _ in range(self.n)]
+        for b in range(self.n, 2 * self.n):
+            if self.active[b] and self.dual[b] != 0:
+                for v in self.deep[b]:
+                    self.vertex_blossoms[v].append(b)
+
+    # Returns the reduced cost of an edge {u, v} with cost c under the dual solution of the last solve,
+    # in the unit of the given costs. The edge does not have to be in the graph
+    # The duals of the vertices and of the blossoms that contain exactly one of u and v are subtracted
+    # The matching is also optimal for the graph with the edge added if the reduced cost is not negative
+    def get_reduced_cost(self, u: int, v: int, c: Decimal) -> Decimal:
+        reduced: Decimal = c * self.cost_scale + self.cost_offset - self.final_dual[u] - self.final_dual[v]
+        blossoms_u: set[int] = set(self.vertex_blossoms[u])
+        blossoms_v: set[int] = set(self.vertex_blossoms[v])
+        for b in blossoms_u ^ blossoms_v:
+            reduced -= self.final_dual[b]
+        return reduced / self.cost_scale
+
+    # Returns the potential of a vertex under the dual solution of the last solve, in the unit of the given costs
+    # The blossom duals are not negative, so get_reduced_cost(u, v, c) >= c - get_potential(u) - get_potential(v)
+    def get_potential(self, v: int) -> Decimal:
+        potential: Decimal = Decimal(self.final_dual[v]) - Decimal(self.cost_offset) / 2
+        for b in self.vertex_blossoms[v]:
+            potential += self.final_dual[b]
+        return potential / self.cost_scale
+
     # Modifies the costs of the graph so the all edges have positive costs
     def positive_costs(self) -> None:
-        min_edge: Decimal = Decimal(0)
+        min_edge: Decimal | int = self.zero
         for s in self.slack:
             if min_edge > s:
                 min_edge = s
 
         for i in range(self.m):
             self.slack[i] -= min_edge
+        self.cost_offset = -min_edge
 
     def retrieve_matching(self) -> list[int]:
         matching: list[int] = []
@@ -510,4 +586,4 @@ class BlossomMatching:
 
     # Returns true if u and v are adjacent in G and not blocked
     def is_adjacent(self, u: int, v: int) -> bool:
-        return self.g.get_adj_mat()[u][v] and not self.is_edge_blocked2(u, v)
+        return self.g.has_edge(u, v) and not self.is_edge_blocked2(u, v)
@@ -1,36 +1,45 @@
 from decimal import Decimal
 
-from edge import Edge
 from alias_graph import AliasGraph
 from binary_heap import BinaryHeap
 from dijkstra_node import DijkstraNode
 from dijkstra_path import DijkstraPath
+from search_graph import SearchGraph
 
 ## ダイクストラ法。
+#  同じグラフに繰り返し探索するときは、SearchGraphを構築して渡すと前処理を省ける。
 
 ## ダイクストラ法で最短経路探索を行う。
-#  @param graph    探索するグラフ。
+#  @param graph    探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
 #  @param start_id 探索のスタートノードのID。
 #  @param goal_id  探索のゴールノードのID。
 #  @return 探索結果の経路。
-def get_shortest_path(graph: AliasGraph, start_id: int, goal_id: int) -> DijkstraPath:
+def get_shortest_path(graph: AliasGraph | SearchGraph, start_id: int, goal_id: int) -> DijkstraPath:
     goal_nodes = set_costs_to_goals(graph, start_id, [goal_id])
     return generate_dijkstra_path(goal_nodes[0])
 
 ## スタートからゴールまでの経路のコストを探索し、ゴールノードを返す。
-#  @param graph    探索するグラフ。
+#  lazyがFalseのときは全ノードを探索中ノードリストに入れてから探索する。
+#  lazyがTrueのときは見つけたノードだけを探索中ノードリストに入れ、ノードも必要になった時点で作る。
+#  全ゴールが確定した時点で探索を終えるので、近いゴールだけなら周辺のノードしか調べない。
+#  スコアが等しいノードはキーを先に設定した順に取り出すので、どちらのモードでも同じ経路を選ぶ。
+#  @param graph    探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
 #  @param start_id 探索のスタートノードのID。
 #  @param goal_ids 探索のゴールノードのIDのリスト。
+#  @param lazy     Trueのとき見つけたノードだけを探索中ノードリストに入れる。
 #  @return ゴールノードのリスト。ゴールノードが存在しないとき要素はNone。
-def set_costs_to_goals(graph: AliasGraph, start_id: int, goal_ids: list[int]) -> list[DijkstraNode | None]:
-    node_list: list[DijkstraNode] = make_node_list(graph)
+def set_costs_to_goals(graph: AliasGraph | SearchGraph, start_id: int, goal_ids: list[int], lazy: bool = False) -> list[DijkstraNode | None]:
+    if lazy:
+        return set_costs_to_goals_lazily(graph, start_id, goal_ids)
+
+    node_map: dict[int, DijkstraNode] = make_node_list(graph)
     open_list: BinaryHeap = BinaryHeap()
-    for n in node_list:
-        open_list.insert(n.get_score(), n.get_id())
+    for n in node_map.values():
+        open_list.insert(n.make_open_key(), n.get_id())
 
-    start_node: DijkstraNode = DijkstraNode.get_dijkstra_node_by_id(node_list, start_id)
-    goal_nodes: list[DijkstraNode] = [DijkstraNode.get_dijkstra_node_by_id(node_list, n) for n in goal_ids]
-    targets = [n for n in goal_nodes if n is not None]
+    start_node: DijkstraNode = node_map.get(start_id)
+    goal_nodes: list[DijkstraNode] = [node_map.get(n) for n in goal_ids]
+    targets: set[int] = {n.get_id() for n in goal_nodes if n is not None}
     if not targets:
         return goal_nodes
 
@@ -39,13 +48,80 @@ def set_costs_to_goals(graph: AliasGraph, start_id: int, goal_ids: list[int]) ->
 
     while targets and len(open_list) > 0:
         min_id = open_list.delete_min()
-        target: DijkstraNode = DijkstraNode.get_dijkstra_node_by_id(node_list, min_id)
-        if target in targets:
-            targets.remove(target)
-        target.expand(node_list, open_list)
+        targets.discard(min_id)
+        node_map[min_id].expand(node_map, open_list)
+
+    return goal_nodes
+
+## 見つけたノードだけを探索中ノードリストに入れて、スタートからゴールまでの経路のコストを探索する。
+#  @param graph    探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
+#  @param start_id 探索のスタートノードのID。
+#  @param goal_ids 探索のゴールノードのIDのリスト。
+#  @return ゴールノードのリスト。ゴールノードが存在しないとき要素はNone。
+def set_costs_to_goals_lazily(graph: AliasGraph | SearchGraph, start_id: int, goal_ids: list[int]) -> list[DijkstraNode | None]:
+    if not isinstance(graph, SearchGraph):
+        graph = SearchGraph(graph)
+
+    node_map: dict[int, DijkstraNode] = dict()
+    goal_nodes: list[DijkstraNode | None] = []
+    for n in goal_ids:
+        if graph.contains_node(n):
+            if n not in node_map:
+                node_map[n] = DijkstraNode(n, graph.get_edge_list(n))
+            goal_nodes.append(node_map[n])
+        else:
+            goal_nodes.append(None)
+    targets: set[int] = {n.get_id() for n in goal_nodes if n is not None}
+    if not targets or not graph.contains_node(start_id):
+        return goal_nodes
+
+    start_node: DijkstraNode | None = node_map.get(start_id)
+    if start_node is None:
+        start_node = DijkstraNode(start_id, graph.get_edge_list(start_id))
+        node_map[start_id] = start_node
+    open_list: BinaryHeap = BinaryHeap()
+    start_node.discover(None, Decimal(0), open_list)
+
+    while targets and len(open_list) > 0:
+        min_id = open_list.delete_min()
+        targets.discard(min_id)
+        node_map[min_id].expand_lazily(node_map, graph, open_list)
 
     return goal_nodes
 
+## スタートから近い順にk個のゴールまでの最小コストを探索する。
+#  k個のゴールが確定した時点で探索を終えるので、周辺のノードしか調べない。
+#  スタート自身はゴールに含めない。
+#  @param graph    探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
+#  @param start_id 探索のスタートノードのID。
+#  @param goal_ids 探索のゴールノードのIDの集合。
+#  @param k        探索するゴールの数。
+#  @return (ゴールのIDと最小コストの組のリスト, 探索半径)のタプル。リストはコストの小さい順。
+#          見つからなかったゴールの最小コストは探索半径以上。全ノードを調べたときの探索半径は無限大。
+def get_nearest_goals(graph: AliasGraph | SearchGraph, start_id: int, goal_ids: set[int], k: int) -> tuple[list[tuple[int, Decimal]], Decimal]:
+    if not isinstance(graph, SearchGraph):
+        graph = SearchGraph(graph)
+
+    nearest: list[tuple[int, Decimal]] = []
+    if k <= 0 or not graph.contains_node(start_id):
+        return (nearest, Decimal('Infinity'))
+
+    start_node = DijkstraNode(start_id, graph.get_edge_list(start_id))
+    node_map: dict[int, DijkstraNode] = {start_id: start_node}
+    open_list: BinaryHeap = BinaryHeap()
+    start_node.discover(None, Decimal(0), open_list)
+
+    while len(open_list) > 0:
+        min_id = open_list.delete_min()
+        node: DijkstraNode = node_map[min_id]
+        if min_id != start_id and min_id in goal_ids:
+            nearest.append((min_id, node.get_score()))
+            if len(nearest) >= k:
+                return (nearest, node.get_score())
+        node.expand_lazily(node_map, graph, open_list)
+
+    return (nearest, Decimal('Infinity'))
+
 ## ゴールノードを終点としてパスを生成して返す。
 #  @param goal ゴールノード。
 #  @return ゴールノードを終点としたパス。
@@ -53,61 +129,46 @@ def generate_dijkstra_path(goal: DijkstraNode) -> DijkstraPath:
     result_path = DijkstraPath()
     if goal is None:
         return result_path
-    result_path.add(goal)
-    while result_path[0].get_parent_node() is not None:
-        result_path.insert(0, result_path[0].get_parent_node())
+    node: DijkstraNode = goal
+    result_path.add(node)
+    while node.get_parent_node() is not None:
+        result_path.add(node.get_parent_node(), node.get_parent_edge())
+        node = node.get_parent_node()
+    result_path.reverse()
     return result_path
 
-## ノードリストを返す。
-#  @param graph 対象グラフ。
-#  @return ノードリスト。
-def make_node_list(graph: AliasGraph) -> list[DijkstraNode]:
-    node_list: list[DijkstraNode] = []
-    for edge in graph.edge_generator():
-        if not contains(node_list, graph.get_alias_node(edge.get_node1())):
-            node_list.append(DijkstraNode(graph.get_alias_node(edge.get_node1())))
-        if not contains(node_list, graph.get_alias_node(edge.get_node2())):
-            node_list.append(DijkstraNode(graph.get_alias_node(edge.get_node2())))
-        node_id: int = graph.get_alias_node(edge.get_node1())
-        dn: DijkstraNode = DijkstraNode.get_dijkstra_node_by_id(node_list, node_id)
-        if dn is not None:
-            dn.add_edge(Edge(graph.get_alias_node(edge.get_node1()),
-                        graph.get_alias_node(edge.get_node2()),
-                        edge.get_cost()))
-        node_id = graph.get_alias_node(edge.get_node2())
-        dn = DijkstraNode.get_dijkstra_node_by_id(node_list, node_id)
-        if dn is not None:
-            dn.add_edge(Edge(graph.get_alias_node(edge.get_node1()),
-                        graph.get_alias_node(edge.get_node2()),
-                        edge.get_cost()))
-    return node_list
-
-## ノードリストが指定ノードを含んでいるときTrueを返す。
-#  @param nodes ノードリスト。
-#  @param node_id 検索するノードのID。
-#  @return ノードリストが指定ノードを含んでいるときTrue。
-def contains(nodes: list[DijkstraNode], node_id: int) -> bool:
-    for dn in nodes:
-        if dn.get_id() == node_id:
-            return True
+## IDをキーにしたノードの辞書を返す。
+#  各ノードの辺リストは探索用グラフのものを共有する。
+#  辞書の順序はノードが辺に初めて現れた順。
+#  @param graph 対象グラフ。AliasGraphのときは探索用グラフを構築する。
+#  @return IDからノードへの辞書。
+def make_node_list(graph: AliasGraph | SearchGraph) -> dict[int, DijkstraNode]:
+    if not isinstance(graph, SearchGraph):
+        graph = SearchGraph(graph)
+    return {n: DijkstraNode(n, graph.get_edge_list(n)) for n in graph.node_iterator()}
 
-    return False
+## ノードの辞書が指定ノードを含んでいるときTrueを返す。
+#  @param nodes IDからノードへの辞書。
+#  @param node_id 検索するノードのID。
+#  @return ノードの辞書が指定ノードを含んでいるときTrue。
+def contains(nodes: dict[int, DijkstraNode], node_id: int) -> bool:
+    return node_id in nodes
 
 ## 指定ノード間の最小コストを返す。
-#  @param graph 探索するグラフ。
+#  @param graph 探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
 #  @param start 経路の始点。
 #  @param goal  経路の終点。
 #  @return 始点と終点間の最小コスト。
-def get_shortest_length(graph: AliasGraph, start: int, goal: int) -> Decimal:
+def get_shortest_length(graph: AliasGraph | SearchGraph, start: int, goal: int) -> Decimal:
     path: DijkstraPath = get_shortest_path(graph, start, goal)
     return path.get_cost()
 
 ## 指定ノード間の最小コストのリストを返す。
-#  @param graph 探索するグラフ。
+#  @param graph 探索するグラフ。AliasGraphまたは構築済みのSearchGraph。
 #  @param start 経路の始点。
 #  @param goal  経路の終点のリスト。
 #  @return 始点と各終点間の最小コストのリスト。
 #          出力リストのインデックスnがstartとgoals[n]間の最小コスト。
-def single_source_shortest_length(graph: AliasGraph, start: int, goals: list[int]) -> list[Decimal]:
-    goals = set_costs_to_goals(graph, start, goals)
+def single_source_shortest_length(graph: AliasGraph | SearchGraph, start: int, goals: list[int]) -> list[Decimal]:
+    goals = set_costs_to_goals(graph, start, goals, lazy=True)
     return [n.get_score() for n in goals]
@@ -1,51 +1,102 @@
+import itertools
+from collections.abc import Iterator
 from decimal import Decimal
 
 from edge import Edge
 from binary_heap import BinaryHeap
+from search_graph import SearchGraph
+
+open_sequence: Iterator[int] = itertools.count()  # 探索中ノードリストのキーに付ける通し番号
 
 ## ダイクストラ法での探索に使用するノード。
 class DijkstraNode:
     ## ダイクストラ法用のノードを構築する。
     #  @param id このノードのID。
-    def __init__(self, id: int):
+    #  @param edge_list このノードに接続された辺のリスト。指定したリストをそのまま共有する。
+    def __init__(self, id: int, edge_list: list[Edge] | None = None):
         self.id: int = id
         self.score: Decimal = Decimal('Infinity')
         self.parent_node: 'DijkstraNode' = None
-        self.edge_list: list[Edge] = []
+        self.parent_edge: Edge | None = None  # 親ノードからこのノードへの辺
+        self.edge_list: list[Edge] = [] if edge_list is None else edge_list
 
     ## このノードから行けるノードを展開する。
-    #  @param node_list  ノードリスト。
+    #  @param node_map   IDからノードへの辞書。
     #  @param open_list  探索中ノードリスト。
-    def expand(self, node_list: list['DijkstraNode'], open_list: BinaryHeap) -> None:
+    def expand(self, node_map: dict[int, 'DijkstraNode'], open_list: BinaryHeap) -> None:
         for e in self.edge_list:
-            destination = self.get_destination(e, node_list)
+            destination = self.get_destination(e, node_map)
             if destination is not None:
-                destination.open(self, self.score + e.get_cost(), open_list)
+                destination.open(self, self.score + e.get_cost(), open_list, e)
 
         if open_list.contains_satellite(self.id):
             open_list.remove(self.id)
 
+    ## このノードから行けるノードを展開する。
+    #  行き先のノードが未作成のときは作成してノード辞書に登録する。
+    #  @param node_map     IDからノードへの辞書。
+    #  @param search_graph 探索用グラフ。
+    #  @param open_list    探索中ノードリスト。
+    def expand_lazily(self, node_map: dict[int, 'DijkstraNode'], search_graph: SearchGraph, open_list: BinaryHeap) -> None:
+        for e in self.edge_list:
+            destination_id: int = e.get_node1()
+            if destination_id == self.id:
+                destination_id = e.get_node2()
+            destination: DijkstraNode | None = node_map.get(destination_id)
+            if destination is None:
+                destination = DijkstraNode(destination_id, search_graph.get_edge_list(destination_id))
+                node_map[destination_id] = destination
+            destination.discover(self, self.score + e.get_cost(), open_list, e)
+
+    ## このノードのスコアと始点ノードを更新する。
+    #  @param parent_node このノードへの始点ノード。
+    #  @param new_score   このノードまでのスコア。
+    #  @param open_list   探索中ノードリスト。
+    #  @param parent_edge 始点ノードからこのノードへの辺。
+    def open(self, parent_node: 'DijkstraNode', new_score: Decimal, open_list: BinaryHeap, parent_edge: Edge | None = None) -> None:
+        if open_list.contains_satellite(self.id):
+            if new_score < self.score:
+                self.parent_node = parent_node
+                self.parent_edge = parent_edge
+                self.score = new_score
+                open_list.change_key(self.make_open_key(), self.id)
+
     ## このノードのスコアと始点ノードを更新する。
+    #  未発見のノードは探索中ノードリストに追加する。探索済みのノードは更新しない。
     #  @param parent_node このノードへの始点ノード。
     #  @param new_score   このノードまでのスコア。
     #  @param open_list   探索中ノードリスト。
-    def open(self, parent_node: 'DijkstraNode', new_score: Decimal, open_list: BinaryHeap) -> None:
+    #  @param parent_edge 始点ノードからこのノードへの辺。
+    def discover(self, parent_node: 'DijkstraNode', new_score: Decimal, open_list: BinaryHeap, parent_edge: Edge | None = None) -> None:
         if open_list.contains_satellite(self.id):
             if new_score < self.score:
                 self.parent_node = parent_node
+                self.parent_edge = parent_edge
                 self.score = new_score
-                open_list.change_key(self.score, self.id)
+                open_list.change_key(self.make_open_key(), self.id)
+        elif self.score.is_infinite():
+            self.parent_node = parent_node
+            self.parent_edge = parent_edge
+            self.score = new_score
+            open_list.insert(self.make_open_key(), self.id)
+
+    ## 探索中ノードリストに入れるキーを返す。
+    #  キーは(スコア, 通し番号)の組で、スコアが等しいノードはキーを先に設定したものから取り出す。
+    #  取り出す順がヒープの実装や全ノードを先に入れるかどうかに依らないので、どのモードで探索しても同じ経路を選ぶ。
+    #  @return 探索中ノードリストのキー。
+    def make_open_key(self) -> tuple[Decimal, int]:
+        return (self.score, next(open_sequence))
 
     ## このノードから指定の辺で行けるノードを返す。
     #  @param edge      このノードに接続された辺。
-    #  @param node_list ノードリスト。
+    #  @param node_map  IDからノードへの辞書。
     #  @return このノードから指定の辺で行けるノード。
-    def get_destination(self, edge: Edge, node_list: list['DijkstraNode']) -> 'DijkstraNode':
+    def get_destination(self, edge: Edge, node_map: dict[int, 'DijkstraNode']) -> 'DijkstraNode':
         destination_id: int = edge.get_node1()
         if destination_id == self.id:
             destination_id = edge.get_node2()
 
-        return DijkstraNode.get_dijkstra_node_by_id(node_list, destination_id)
+        return node_map.get(destination_id)
 
     ## このノードに接続された辺を追加する。
     #  @param edge 追加する辺。
@@ -67,28 +118,39 @@ class DijkstraNode:
     def get_parent_node(self) -> 'DijkstraNode':
         return self.parent_node
 
-    ## このノードから指定IDのノードまでのコストを返す。
+    ## 親ノードからこのノードへの辺を返す。
+    #  @return 親ノードからこのノードへの辺。始点ノードや未到達のノードではNone。
+    def get_parent_edge(self) -> Edge | None:
+        return self.parent_edge
+
+    ## このノードから指定IDのノードへの辺のうち、コストが最小のものを返す。
     #  @param destination_id 行き先ノードのID。
-    #  @return このノードから指定IDのノードまでのコスト。
-    def get_weight(self, destination_id: int) -> Decimal:
-        weight: Decimal = Decimal(100000)
+    #  @return このノードから指定IDのノードへの辺。
+    #  @exception ValueError 指定IDのノードへの辺が無いとき。
+    def get_edge_to(self, destination_id: int) -> Edge:
+        result: Edge | None = None
         for e in self.edge_list:
             node_id: int = e.get_node1()
             if node_id == self.id:
                 node_id = e.get_node2()
-            if node_id == destination_id:
-                weight = e.get_cost()
-        return weight
+            if node_id == destination_id and (result is None or e.get_cost() < result.get_cost()):
+                result = e
+        if result is None:
+            raise ValueError(f'DijkstraNode: no edge from {self.id} to {destination_id}.')
+        return result
+
+    ## このノードから指定IDのノードまでのコストを返す。
+    #  @param destination_id 行き先ノードのID。
+    #  @return このノードから指定IDのノードまでの辺の最小コスト。
+    #  @exception ValueError 指定IDのノードへの辺が無いとき。
+    def get_weight(self, destination_id: int) -> Decimal:
+        return self.get_edge_to(destination_id).get_cost()
 
     ## ダイクストラノードをIDで検索する。
-    #  @param node_list ノードリスト。
+    #  @param node_map IDからノードへの辞書。
     #  @param id 探索するID。
     #  @return 指定されたIDのダイクストラノード。
     #          存在しないときはNoneを返す。
     @staticmethod
-    def get_dijkstra_node_by_id(node_list: list['DijkstraNode'], id: int) -> 'DijkstraNode':
-        for dijkstra_node in node_list:
-            if dijkstra_node.get_id() == id:
-                return dijkstra_node
-
-        return None
+    def get_dijkstra_node_by_id(node_map: dict[int, 'DijkstraNode'], id: int) -> 'DijkstraNode':
+        return node_map.get(id)
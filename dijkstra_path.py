@@ -1,22 +1,32 @@
 from decimal import Decimal
 
+from edge import Edge
 from dijkstra_node import DijkstraNode
 
 ## DijkstraNodeのパス。
+#  隣り合うノードを結ぶ辺と、パスの総コストも持つ。
 class DijkstraPath:
     def __init__(self):
         self.path: list[DijkstraNode] = []
+        self.edges: list[Edge] = []  # edges[i]はpath[i]とpath[i + 1]を結ぶ辺
+        self.cost: Decimal = Decimal(0)  # パスの総コスト
 
     ## パスの最後に指定されたノードを追加する。
     #  @param node このパスに追加されるノード。
-    def add(self, node: DijkstraNode) -> None:
+    #  @param edge 最後のノードと追加するノードを結ぶ辺。省略したときはコストが最小の辺を探す。
+    #  @exception ValueError 最後のノードと追加するノードを結ぶ辺が無いとき。
+    def add(self, node: DijkstraNode, edge: Edge | None = None) -> None:
+        if self.path:
+            if edge is None:
+                edge = self.path[-1].get_edge_to(node.get_id())
+            self.edges.append(edge)
+            self.cost += edge.get_cost()
         self.path.append(node)
 
-    ## このパス内の指定された位置に指定されたノードを挿入する。その位置とそれ以降にノードがあればそれらを右に移動させ、各要素のインデックスに1を加える。
-    #  @param index 指定のノードが挿入される位置のインデックス。
-    #  @param node  挿入されるノード。
-    def insert(self, index: int, node: DijkstraNode) -> None:
-        self.path.insert(index, node)
+    ## このパスの向きを逆にする。
+    def reverse(self) -> None:
+        self.path.reverse()
+        self.edges.reverse()
 
     ## このパス内の指定された位置にあるノードを返す。
     #  @param index 返されるノードのインデックス。
@@ -29,15 +39,13 @@ class DijkstraPath:
     def __len__(self) -> int:
         return len(self.path)
 
+    ## このパス内の指定された位置にある辺を返す。
+    #  @param index 返される辺のインデックス。
+    #  @return 指定された位置のノードと次のノードを結ぶ辺。
+    def get_edge(self, index: int) -> Edge:
+        return self.edges[index]
+
     ## パスの総コストを返す。
     #  @return パスの総コスト。
     def get_cost(self) -> Decimal:
-        cost: Decimal = Decimal(0)
-        path_size: int = len(self.path)
-
-        if path_size >= 2:
-            for i in range(path_size - 1):
-                weight: Decimal = self.path[i].get_weight(self.path[i + 1].get_id())
-                cost += weight
-
-        return cost
+        return self.cost
@@ -0,0 +1,119 @@
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+import dijkstra
+from dijkstra_node import DijkstraNode
+from search_graph import SearchGraph
+
+worker_state: dict = dict()  # 並列探索の各プロセスで初期化時に受け取ったグラフとノードリスト
+
+## 指定ノード間の最小コストの表。
+#  各ノードから、リストで後ろにあるノードへの探索を1回ずつ行い、全ゴールが確定した時点で打ち切る。
+#  探索は見つけたノードだけを探索中ノードリストに入れるダイクストラ法なので、近いゴールだけの行は周辺しか調べない。
+#  コストが等しい経路が複数あるときも、dijkstra.get_shortest_pathと同じ経路を選ぶ。
+#  最小コストはノード数の2乗の要素を持つ1次元のリストに行優先で格納する。
+#  各探索の最短経路木のうち、ゴールへの経路上のノードの親を残すので、経路を再探索せずに復元できる。
+#  探索は互いに独立なので、複数のプロセスで並列に行える。
+class DistanceTable:
+    ## 表を構築する。
+    #  @param search_graph 探索用グラフ。
+    #  @param nodes ノードリスト。重複しないこと。
+    #  @param jobs  探索を行うプロセスの数。1のときはこのプロセスで順に探索する。
+    def __init__(self, search_graph: SearchGraph, nodes: list[int], jobs: int = 1):
+        self.nodes: list[int] = list(nodes)
+        self.index: dict[int, int] = {n: i for i, n in enumerate(self.nodes)}  # ノード -> 表のインデックス
+        self.size: int = len(self.nodes)
+        self.costs: list[Decimal] = [Decimal('Infinity')] * (self.size * self.size)  # 行優先の最小コスト
+        self.parents: list[dict[int, int]] = []  # 探索元のインデックス -> (ノード -> 最短経路木の親ノード)
+
+        rows: Iterable[tuple[list[Decimal], dict[int, int]]]
+        if jobs > 1 and self.size > 2:
+            # グラフとノードリストは各プロセスの初期化時に一度だけ送る。
+            # 前の行ほどゴールが多いので、小さく分けて割り当てる。
+            chunksize: int = max(1, self.size // (jobs * 8))
+            with ProcessPoolExecutor(max_workers=jobs, initializer=DistanceTable.init_worker, initargs=(search_graph, self.nodes)) as executor:
+                rows = list(executor.map(DistanceTable.search_in_worker, range(self.size), chunksize=chunksize))
+        else:
+            rows = (DistanceTable.search(search_graph, self.nodes, i) for i in range(self.size))
+
+        for i, (costs, parent) in enumerate(rows):
+            self.costs[i * self.size + i] = Decimal(0)
+            for j, cost in enumerate(costs, i + 1):
+                self.costs[i * self.size + j] = cost
+                self.costs[j * self.size + i] = cost
+            self.parents.append(parent)
+
+    ## nodes[i]からnodes[i + 1:]への最小コストと、最短経路木のうちゴールへの経路上の親を返す。
+    #  dijkstra.set_costs_to_goalsのlazyモードで探索する。
+    #  @param search_graph 探索用グラフ。
+    #  @param nodes ノードリスト。
+    #  @param i 探索元のインデックス。
+    #  @return (最小コストのリスト, ノード -> 親ノードの辞書)のタプル。到達できないゴールのコストは無限大。
+    @staticmethod
+    def search(search_graph: SearchGraph, nodes: list[int], i: int) -> tuple[list[Decimal], dict[int, int]]:
+        goals: list[DijkstraNode | None] = dijkstra.set_costs_to_goals(search_graph, nodes[i], nodes[i + 1:], lazy=True)
+        costs: list[Decimal] = []
+        parent: dict[int, int] = dict()
+        for goal in goals:
+            if goal is None or goal.get_score().is_infinite():
+                costs.append(Decimal('Infinity'))
+                continue
+            costs.append(goal.get_score())
+            node: DijkstraNode = goal
+            while node.get_parent_node() is not None and node.get_id() not in parent:
+                parent[node.get_id()] = node.get_parent_node().get_id()
+                node = node.get_parent_node()
+        return (costs, parent)
+
+    ## 並列探索の各プロセスを初期化する。
+    #  @param search_graph 探索用グラフ。
+    #  @param nodes ノードリスト。
+    @staticmethod
+    def init_worker(search_graph: SearchGraph, nodes: list[int]) -> None:
+        worker_state['search_graph'] = search_graph
+        worker_state['nodes'] = nodes
+
+    ## 並列探索の各プロセスで、初期化時に受け取ったグラフを探索する。
+    #  @param i 探索元のインデックス。
+    #  @return search()と同じ。
+    @staticmethod
+    def search_in_worker(i: int) -> tuple[list[Decimal], dict[int, int]]:
+        return DistanceTable.search(worker_state['search_graph'], worker_state['nodes'], i)
+
+    ## 2つのノード間の最小コストを返す。
+    #  @param u ノード。
+    #  @param v ノード。
+    #  @return 最小コスト。到達できないときは無限大。
+    #  @exception KeyError ノードが表に無いとき。
+    def get_cost(self, u: int, v: int) -> Decimal:
+        return self.costs[self.index[u] * self.size + self.index[v]]
+
+    ## 2つのノード間の最短経路のノードリストを返す。
+    #  @param u 経路の始点。
+    #  @param v 経路の終点。
+    #  @return 始点から終点までのノードリスト。到達できないときは空のリスト。
+    #  @exception KeyError ノードが表に無いとき。
+    def get_path(self, u: int, v: int) -> list[int]:
+        i: int = self.index[u]
+        j: int = self.index[v]
+        if i > j:
+            path: list[int] = self.get_path(v, u)
+            path.reverse()
+            return path
+        if i == j:
+            return [u]
+        if self.costs[i * self.size + j].is_infinite():
+            return []
+
+        parent: dict[int, int] = self.parents[i]
+        path = [v]
+        while path[-1] != u:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    ## ノードの数を返す。
+    #  @return ノードの数。
+    def __len__(self) -> int:
+        return self.size
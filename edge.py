@@ -1,19 +1,29 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 ## コスト付き無向エッジ。
 #  Immutable。
-@dataclass(frozen=True)
+#  __slots__を使い、端点の向きをそろえた組は構築時に計算しておく。
+#  ハッシュ値はその組とコストのタプルから求める。Decimalは自身のハッシュ値を保持するので、Decimalの演算は不要。
+@dataclass(frozen=True, slots=True)
 class Edge:
     node1: int  # ノード(0以上の整数)。
     node2: int  # ノード(0以上の整数)。
     cost: Decimal  # コスト(正の値)。
+    low: int = field(init=False, repr=False, compare=False)  # 小さい方のノード
+    high: int = field(init=False, repr=False, compare=False)  # 大きい方のノード
 
     ## コンストラクタの引数チェック。
     #  @exception ValueError 引数の値が不正のとき。
     def __post_init__(self):
         if not self.is_valid_arguments(self.node1, self.node2, self.cost):
             raise ValueError(f'Edge constructor: node = ({self.node1}, {self.node2}), cost = {self.cost} is invalid.')
+        if self.node1 <= self.node2:
+            object.__setattr__(self, 'low', self.node1)
+            object.__setattr__(self, 'high', self.node2)
+        else:
+            object.__setattr__(self, 'low', self.node2)
+            object.__setattr__(self, 'high', self.node1)
 
     ## 引数の値が辺の値として適性のときTrueを返す。
     #  @param node1 ノード。
@@ -38,6 +48,11 @@ class Edge:
     def get_cost(self) -> Decimal:
         return self.cost
 
+    ## 端点の向きをそろえたキーを返す。
+    #  @return (小さいノード, 大きいノード)のタプル。
+    def get_key(self) -> tuple[int, int]:
+        return (self.low, self.high)
+
     ## この辺について、指定されたノードと反対側のノードを返す。
     #  この辺が接続していないノードが指定されたときはNoneを返す。
     #  @param node 指定ノード。
@@ -51,26 +66,14 @@ class Edge:
         return None
 
     def __eq__(self, o):
-        if o is None:
-            return False
+        if self is o:
+            return True
         if not isinstance(o, Edge):
             return False
-        if self.cost != o.cost:
-            return False
-        if o.node1 == self.node1 and o.node2 == self.node2:
-            return True
-        if o.node1 == self.node2 and o.node2 == self.node1:
-            return True
-        return False
+        return self.low == o.low and self.high == o.high and self.cost == o.cost
 
     def __hash__(self):
-        min_node = min(self.node1, self.node2)
-        max_node = max(self.node1, self.node2)
-        result = 17
-        result = 31 * result + min_node
-        result = 31 * result + max_node
-        result = 31 * result + self.cost
-        return hash(result)
+        return hash((self.low, self.high, self.cost))
 
     ## この辺が指定のノードを含んでいるとき、Trueを返す。
     #  @param node ノード。
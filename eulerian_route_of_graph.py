@@ -1,3 +1,4 @@
+from edge import Edge
 from alias_graph import AliasGraph
 
 ## オイラールートを作る。
@@ -14,18 +15,167 @@ def eulerian_route_of_graph(graph: AliasGraph, start_node: int = -1) -> list[lis
     return route
 
 ## オイラールートを作る。
+#  Hierholzer法による。未使用の辺が残っている最初のノードから部分ループを作り、
+#  そのノードがルート中で最後に現れる位置の後ろに部分ループを挿入することを繰り返す。
+#  ノードごとの接続辺リストと使用済みフラグで辺を選ぶので、グラフのコピーや辺の削除は行わない。
+#  ルートは連結リストで持ち、各ステップにルート上の順序を表す整数のラベルを付けて
+#  エイリアスノードごとの最後の出現位置を追跡する。
 #  @param graph 元のグラフ。
 #  @param start_node 始点。
 #  @return オイラールートのノードリスト。
+#  @exception ValueError 入力グラフからオイラールートが生成できないとき。
 def generate_initial_euler_circuit(graph: AliasGraph, start_node: int) -> list[list[int]]:
-    real_route: list[list[int]]  = []
-    work_graph: AliasGraph = AliasGraph.copy_instance(graph)
-
-    while not work_graph.is_empty():
-        start_node: int = select_start_node(work_graph, real_route, start_node)
-        temp_route = generate_loop_route(work_graph, start_node)
-        merge_euler_circuit(real_route, temp_route, work_graph)
-    return real_route
+    edges: list[Edge] = list(graph.edge_generator())
+    if not edges:
+        return []
+
+    alias_map: dict[int, int] = graph.alias_map
+    alias_dict: dict[int, set[int]] = graph.get_alias_dict()
+
+    adjacency: dict[int, list[int]] = dict()  # オリジナルノード -> 接続する辺のインデックス
+    remaining: dict[int, int] = dict()  # エイリアスノード -> 未使用の辺の端点数
+    for i, e in enumerate(edges):
+        node1: int = e.get_node1()
+        node2: int = e.get_node2()
+        adjacency.setdefault(node1, []).append(i)
+        if node2 != node1:
+            adjacency.setdefault(node2, []).append(i)
+        for n in (node1, node2):
+            a: int = alias_map.get(n, n)
+            remaining[a] = remaining.get(a, 0) + 1
+    adjacency_pos: dict[int, int] = dict()  # オリジナルノード -> 未使用の辺を探し始める位置
+    members: dict[int, list[int]] = dict()  # エイリアスノード -> オリジナルノードのリスト
+    member_pos: dict[int, int] = dict()  # エイリアスノード -> 未使用の辺を探し始めるメンバーの位置
+    used: list[bool] = [False] * len(edges)
+
+    ## 指定エイリアスノードから出る未使用の辺を1本選び、使用済みにする。
+    #  @param alias エイリアスノード。
+    #  @return (辺の始点のオリジナルノード, 辺の終点のオリジナルノード)。
+    #  @exception ValueError 未使用の辺が無いとき。
+    def use_edge_from(alias: int) -> tuple[int, int]:
+        if alias not in members:
+            members[alias] = list(alias_dict[alias]) if alias in alias_dict else [alias]
+            member_pos[alias] = 0
+        nodes: list[int] = members[alias]
+        while member_pos[alias] < len(nodes):
+            n: int = nodes[member_pos[alias]]
+            adj: list[int] = adjacency.get(n, [])
+            pos: int = adjacency_pos.get(n, 0)
+            while pos < len(adj) and used[adj[pos]]:
+                pos += 1
+            adjacency_pos[n] = pos
+            if pos < len(adj):
+                used[adj[pos]] = True
+                to_node: int = edges[adj[pos]].get_paired_node(n)
+                remaining[alias_map.get(n, n)] -= 1
+                remaining[alias_map.get(to_node, to_node)] -= 1
+                return n, to_node
+            member_pos[alias] += 1
+        raise ValueError()
+
+    ## 指定エイリアスノードから一周するルートを作る。
+    #  @param start_alias 始点のエイリアスノード。
+    #  @return ルート。
+    def generate_loop(start_alias: int) -> list[list[int]]:
+        loop: list[list[int]] = []
+        from_alias: int = start_alias
+        while True:
+            from_node, to_node = use_edge_from(from_alias)
+            loop.append([from_node, to_node])
+            from_alias = alias_map.get(to_node, to_node)
+            if from_alias == start_alias:
+                return loop
+
+    if start_node < 0:
+        start_node = edges[0].get_node1()
+    if start_node not in adjacency:
+        start_alias: int = start_node
+    else:
+        start_alias = alias_map.get(start_node, start_node)
+
+    # ルートの連結リスト。ラベルの大小がルート上の順序になる。
+    steps: list[list[int]] = []
+    labels: list[int] = []
+    next_step: list[int] = []
+    last_to: dict[int, int] = dict()  # エイリアスノード -> そのノードを終点とする最後のステップ
+    label_gap: int = 1 << 32  # 末尾に追加するステップのラベルの間隔
+
+    ## ステップの終点のエイリアスノードについて、最後の出現位置を更新する。
+    #  @param index ステップのインデックス。
+    def register(index: int) -> None:
+        to_alias: int = alias_map.get(steps[index][1], steps[index][1])
+        last = last_to.get(to_alias)
+        if last is None or labels[last] < labels[index]:
+            last_to[to_alias] = index
+
+    ## 部分ループを指定ステップの後ろに挿入し、ラベルを付ける。
+    #  挿入位置からj個後ろのステップまでのラベルの幅が(挿入するステップ数 + j)の2乗を超える最小のjを探し、
+    #  その間に挿入するステップと、間にある既存のステップのラベルを等間隔に付け直す。
+    #  付け直すステップ数は償却でO(log n)なので、ラベルの比較は常に整数1つで済む。
+    #  @param insert_point 挿入位置のステップのインデックス。
+    #  @param loop 部分ループ。
+    def insert_loop(insert_point: int, loop: list[list[int]]) -> None:
+        base: int = labels[insert_point]
+        following: int = next_step[insert_point]
+        moved: list[int] = []  # ラベルを付け直す既存のステップ
+        bound: int = following
+        while bound >= 0 and labels[bound] - base <= (len(loop) + len(moved) + 1) ** 2:
+            moved.append(bound)
+            bound = next_step[bound]
+
+        inserted: list[int] = []
+        prev: int = insert_point
+        for step in loop:
+            index: int = len(steps)
+            steps.append(step)
+            labels.append(0)
+            next_step.append(following)
+            next_step[prev] = index
+            prev = index
+            inserted.append(index)
+
+        relabeled: list[int] = inserted + moved
+        if bound < 0:
+            for i, index in enumerate(relabeled, 1):
+                labels[index] = base + i * label_gap
+        else:
+            width: int = labels[bound] - base
+            for i, index in enumerate(relabeled, 1):
+                labels[index] = base + i * width // (len(relabeled) + 1)
+        for index in inserted:
+            register(index)
+
+    for i, step in enumerate(generate_loop(start_alias)):
+        steps.append(step)
+        labels.append(i * label_gap)
+        next_step.append(i + 1)
+        register(i)
+    next_step[-1] = -1
+    num_used: int = len(steps)
+
+    scan: int = 0
+    while num_used < len(edges):
+        while scan >= 0 and remaining[alias_map.get(steps[scan][0], steps[scan][0])] == 0:
+            scan = next_step[scan]
+        if scan < 0:
+            raise ValueError()
+        start_alias = alias_map.get(steps[scan][0], steps[scan][0])
+        loop: list[list[int]] = generate_loop(start_alias)
+        num_used += len(loop)
+
+        insert_point: int = last_to[start_alias]
+        following: int = next_step[insert_point]
+        insert_loop(insert_point, loop)
+        # 直前のステップの後ろに挿入したときは、挿入した部分ループから走査を再開する。
+        if following == scan:
+            scan = next_step[insert_point]
+
+    route: list[list[int]] = []
+    index = 0
+    while index >= 0:
+        route.append(steps[index])
+        index = next_step[index]
+    return route
 
 ## start_nodeから一周するルートを作る。
 #  ルートに使用されたエッジはgraphから削除される。
@@ -1,3 +1,4 @@
+import argparse
 import sys
 from decimal import Decimal
 import itertools
@@ -7,10 +8,15 @@ from alias_graph import AliasGraph
 from graph_to_eulerian_graph import graph_to_eulerian_graph
 from eulerian_route_of_graph import eulerian_route_of_graph
 import graph_file_loader
+from node_name_table import NodeNameTable
 
 class EulerianTask:
-    def __init__(self):
-        self.node_list: list[str]  = []
+    ## @param nearest 指定したときは、奇数次数の各ノードから近い順にこの数のノードとの間の辺だけでマッチングを始める。
+    #  @param jobs    奇数次数のノード間の最短距離を探索するプロセスの数。
+    def __init__(self, nearest: int | None = None, jobs: int = 1):
+        self.node_list: NodeNameTable = NodeNameTable()
+        self.nearest: int | None = nearest
+        self.jobs: int = jobs
         self.start_goal_edge: Edge | None = None
 
     def gen_eulerian_graph_from_list(self, data_list_file: str, start_point: str, goal_point: str) -> None:
@@ -30,7 +36,7 @@ class EulerianTask:
         self.overwrite_start_goal_route(graph, big_cost)
 
         try:
-            graph = graph_to_eulerian_graph(graph)
+            graph = graph_to_eulerian_graph(graph, self.nearest, self.jobs)
         except ValueError as e:
             print(e, file=sys.stderr)
             return
@@ -84,7 +90,7 @@ class EulerianTask:
         self.overwrite_start_goal_route(graph, big_cost)
 
         try:
-            graph = graph_to_eulerian_graph(graph)
+            graph = graph_to_eulerian_graph(graph, self.nearest, self.jobs)
         except ValueError as e:
             print(e, file=sys.stderr)
             return
@@ -119,7 +125,7 @@ class EulerianTask:
     #  @param graph グラフ。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def show_loaded_data(graph: AliasGraph, node_list: list[str]) -> None:
+    def show_loaded_data(graph: AliasGraph, node_list: NodeNameTable) -> None:
         print(f'ノード数: {graph.get_real_node_size()}  エッジ数: {graph.get_edge_size()}')
 
         index = 0
@@ -155,12 +161,26 @@ class EulerianTask:
     #  @param node_list ノード名のリスト。
     #  @return     ノード名が有効のときTrue。
     @staticmethod
-    def is_valid_node_name(name: str, node_list: list[str]) -> bool:
+    def is_valid_node_name(name: str, node_list: NodeNameTable) -> bool:
         if not name:
             return False
 
         return name in node_list
 
+    ## コマンドライン引数を1以上の整数に変換する。argparseのtypeに指定する。
+    #  @param value 引数の文字列。
+    #  @return 変換した整数。
+    #  @exception argparse.ArgumentTypeError 整数でないか、1未満のとき。
+    @staticmethod
+    def parse_positive_int(value: str) -> int:
+        try:
+            n: int = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'整数ではありません: {value}')
+        if n < 1:
+            raise argparse.ArgumentTypeError(f'1以上の整数を指定してください: {value}')
+        return n
+
     ## (準)オイラーグラフを表示する。
     #  @param graph オイラーグラフ。
     def print_eulerian_graph(self, graph: AliasGraph) -> None:
@@ -174,7 +194,7 @@ class EulerianTask:
     #  @param graph グラフ。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def sort_and_print_edges(graph: AliasGraph, node_list: list[str]) -> None:
+    def sort_and_print_edges(graph: AliasGraph, node_list: NodeNameTable) -> None:
         edges: list[tuple[str, str, Decimal]] = EulerianTask.generate_edge_list(graph, node_list)
         EulerianTask.sort_edges(edges)
         EulerianTask.print_edges(edges)
@@ -185,7 +205,7 @@ class EulerianTask:
     #  @param graph グラフ。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def generate_edge_list(graph: AliasGraph, node_list: list[str]) -> list[tuple[str, str, Decimal]]:
+    def generate_edge_list(graph: AliasGraph, node_list: NodeNameTable) -> list[tuple[str, str, Decimal]]:
         edge_list = []
         for edge in graph.edge_generator():
             if node_list[edge.get_node1()] < node_list[edge.get_node2()]:
@@ -226,7 +246,7 @@ class EulerianTask:
     #  @param graph グラフ。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def sort_and_print_transfers(graph: AliasGraph, node_list: list[str]) -> None:
+    def sort_and_print_transfers(graph: AliasGraph, node_list: NodeNameTable) -> None:
         transfers = EulerianTask.generate_transfer_list(graph, node_list)
         EulerianTask.sort_edges(transfers)
         EulerianTask.print_transfers(transfers)
@@ -239,7 +259,7 @@ class EulerianTask:
     #  @param node_list ノード名のリスト。
     #  @return 同じとみなすノードの組み合わせのリスト。
     @staticmethod
-    def generate_transfer_list(graph: AliasGraph, node_list: list[str]) -> list[tuple[str, str]]:
+    def generate_transfer_list(graph: AliasGraph, node_list: NodeNameTable) -> list[tuple[str, str]]:
         transfer_list = []
         alias_dict: dict[int, set[int]] = graph.get_alias_dict()
         for v in alias_dict.values():
@@ -262,7 +282,7 @@ class EulerianTask:
     #  @param route オイラールートのノードリスト。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def print_eulerian_route(route: list[list[int]], node_list: list[str]) -> None:
+    def print_eulerian_route(route: list[list[int]], node_list: NodeNameTable) -> None:
         prev_from = route[0][0]
         prev_to   = route[0][1]
         print(node_list[prev_from])
@@ -285,7 +305,7 @@ class EulerianTask:
     #  @param node_list ノード名のリスト。
     #  @param show_route_list Trueのとき全エッジを表示。
     @staticmethod
-    def print_result(route: list[list[int]], total_cost: Decimal, node_list: list[str], show_route_list: bool) -> None:
+    def print_result(route: list[list[int]], total_cost: Decimal, node_list: NodeNameTable, show_route_list: bool) -> None:
         print()
         print(f'最終エッジ数: {len(route)}')
         print(f'総コスト: {total_cost}')
@@ -297,7 +317,7 @@ class EulerianTask:
     #  @param route オイラールートのノードリスト。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def print_euler_route(route: list[list[int]], node_list: list[str]) -> None:
+    def print_euler_route(route: list[list[int]], node_list: NodeNameTable) -> None:
         print('ルート例:')
         prev_from = route[0][0]
         prev_to   = route[0][1]
@@ -326,7 +346,7 @@ class EulerianTask:
     #  @param route オイラールートのノードリスト。
     #  @param node_list ノード名のリスト。
     @staticmethod
-    def print_all_route(route: list[list[int]], node_list: list[str]) -> None:
+    def print_all_route(route: list[list[int]], node_list: NodeNameTable) -> None:
         print()
         print('通過エッジ一覧:')
         print(f'{node_list[route[0][0]]} - {node_list[route[0][1]]}')
@@ -344,7 +364,7 @@ class EulerianTask:
     #  @param route オイラールートのノードリスト。
     #  @return 削除後のノードリスト。
     @staticmethod
-    def remove_added_edge(start_point: str, goal_point: str, node_list: list[str], route: list[list[int]]) -> list[list[int]]:
+    def remove_added_edge(start_point: str, goal_point: str, node_list: NodeNameTable, route: list[list[int]]) -> list[list[int]]:
         start_node: int = node_list.index(start_point)
         goal_node: int  = node_list.index(goal_point)
 
@@ -1,30 +1,88 @@
 from decimal import Decimal
-from collections import deque
+from collections import Counter, deque
 from collections.abc import Generator, Iterator
 
 from edge import Edge
 
 ## グラフ。次数0のノードは作成不可。
+#  辺は追加時に払い出すハンドルで管理し、同じ辺の多重度とノードの次数を逐次更新する。
 class Graph:
     def __init__(self):
-        self.edge_list: list[Edge] = []
+        self.edge_store: dict[int, Edge] = dict()  # ハンドル -> 辺 (追加順)
+        self.handle_list: list[int] = []  # 追加順のハンドル。削除された辺のハンドルはまとめて取り除く
+        self.edge_handles: dict[Edge, dict[int, None]] = dict()  # 辺 -> 同じ辺のハンドル (追加順)
+        self.incidence: dict[int, dict[int, Edge]] = dict()  # ノード -> 接続する辺のハンドル -> 辺 (追加順)
+        self.degree: dict[int, int] = dict()  # ノード -> 次数
         self.node_set: set[int] = set()
+        self.next_handle: int = 0
 
     ## 辺を追加する。辺がNoneの場合は追加しない。
     #  @param edge 追加する辺。
-    def add_edge(self, edge: Edge) -> None:
+    #  @return 追加した辺のハンドル。辺がNoneの場合はNone。
+    def add_edge(self, edge: Edge) -> int | None:
         if edge == None:
-            return
-
-        self.edge_list.append(edge)
-        self.node_set.add(edge.get_node1())
-        self.node_set.add(edge.get_node2())
-
-    ## 辺を削除する。
+            return None
+
+        handle: int = self.next_handle
+        self.next_handle += 1
+        self.edge_store[handle] = edge
+        self.edge_handles.setdefault(edge, dict())[handle] = None
+        if len(self.handle_list) >= 2 * len(self.edge_store):
+            self.compact_handle_list()
+        self.handle_list.append(handle)
+
+        node1: int = edge.get_node1()
+        node2: int = edge.get_node2()
+        self.incidence.setdefault(node1, dict())[handle] = edge
+        self.incidence.setdefault(node2, dict())[handle] = edge
+        self.degree[node1] = self.degree.get(node1, 0) + 1
+        self.degree[node2] = self.degree.get(node2, 0) + 1
+        self.node_set.add(node1)
+        self.node_set.add(node2)
+        return handle
+
+    ## 辺を削除する。同じ辺が複数あるときは最も前に追加された辺を削除する。
     #  @param edge 削除する辺。
+    #  @exception ValueError 辺が含まれていないとき。
     def remove_edge(self, edge: Edge) -> None:
-        self.edge_list.remove(edge)
-        self.refresh_node_set()
+        handles: dict[int, None] | None = self.edge_handles.get(edge)
+        if not handles:
+            raise ValueError(f'Graph.remove_edge: {edge} is not in graph.')
+        self.remove_edge_by_handle(next(iter(handles)))
+
+    ## ハンドルで指定した辺を削除する。
+    #  @param handle 削除する辺のハンドル。
+    #  @exception KeyError ハンドルが無効のとき。
+    def remove_edge_by_handle(self, handle: int) -> None:
+        edge: Edge = self.edge_store.pop(handle)
+        handles: dict[int, None] = self.edge_handles[edge]
+        del handles[handle]
+        if not handles:
+            del self.edge_handles[edge]
+
+        node1: int = edge.get_node1()
+        node2: int = edge.get_node2()
+        self.degree[node1] -= 1
+        self.degree[node2] -= 1
+        for node in {node1, node2}:
+            incident_edges: dict[int, Edge] = self.incidence[node]
+            del incident_edges[handle]
+            if not incident_edges:
+                del self.incidence[node]
+                del self.degree[node]
+                self.node_set.discard(node)
+
+    ## ハンドルで指定した辺を返す。
+    #  @param handle 辺のハンドル。
+    #  @return 指定されたハンドルの辺。
+    def get_edge_by_handle(self, handle: int) -> Edge:
+        return self.edge_store[handle]
+
+    ## 指定のノードに接続する辺のハンドルのリストを返す。
+    #  @param node 対象のノード。
+    #  @return 指定のノードに接続する辺のハンドルのリスト。
+    def get_handle_list_by_node(self, node: int) -> list[int]:
+        return list(self.incidence.get(node, ()))
 
     ## ノードの一覧のコピーを返す。
     #  @return ノードの一覧のコピー。
@@ -34,13 +92,13 @@ class Graph:
     ## 辺のジェネレータを返す。
     #  @return 辺のジェネレータ。
     def edge_generator(self) -> Generator[Edge, None, None]:
-        for e in self.edge_list:
+        for e in self.edge_store.values():
             yield e
 
     ## 辺の数を返す。
     #  @return 辺の数。
     def get_edge_size(self) -> int:
-        return len(self.edge_list)
+        return len(self.edge_store)
 
     ## ノードの数を返す。
     #  @return ノードの数。
@@ -48,17 +106,30 @@ class Graph:
         return len(self.node_set)
 
     ## 指定されたインデックスの辺を返す。
+    #  インデックスは追加順(削除された辺を除く)。
+    #  辺を削除した後の最初の呼び出しでハンドルのリストを詰め直し、以降は定数時間で返す。
     #  @param i 返される辺のインデックス。
     #  @return 指定されたインデックスにある辺。
+    #  @exception IndexError インデックスが範囲外のとき。
     def get_edge(self, i: int) -> Edge:
-        return self.edge_list[i]
+        if i < 0:
+            i += len(self.edge_store)
+        if i < 0 or i >= len(self.edge_store):
+            raise IndexError('Graph.get_edge: index out of range')
+        if len(self.handle_list) != len(self.edge_store):
+            self.compact_handle_list()
+        return self.edge_store[self.handle_list[i]]
+
+    ## 削除された辺のハンドルをハンドルのリストから取り除く。
+    def compact_handle_list(self) -> None:
+        self.handle_list = [h for h in self.handle_list if h in self.edge_store]
 
     ## 指定のノードを結ぶ辺を1本返す。
     #  @param node1 ノード。
     #  @param node2 ノード。
     #  @return 指定のノードを結ぶ辺。辺が無いときはNoneを返す。
     def get_edge_by_nodes(self, node1: int, node2: int) -> Edge | None:
-        for e in self.edge_list:
+        for e in self.incidence.get(node1, dict()).values():
             if e.contains_nodes(node1, node2):
                 return e
         return None
@@ -70,7 +141,7 @@ class Graph:
     #  @return 指定のノードを含む辺のリスト。
     def get_edge_list_by_node(self, node: int, e_list: list[Edge] = None) -> list[Edge]:
         if e_list == None:
-            e_list = self.edge_list
+            return list(self.incidence.get(node, dict()).values())
         result: list[Edge] = []
         for e in e_list:
             if e.get_node1() == node or e.get_node2() == node:
@@ -79,13 +150,22 @@ class Graph:
 
     ## グラフを空にする。
     def clear(self) -> None:
-        self.edge_list.clear()
+        self.edge_store.clear()
+        self.handle_list.clear()
+        self.edge_handles.clear()
+        self.incidence.clear()
+        self.degree.clear()
         self.node_set.clear()
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Graph):
             return False
-        return Graph.is_same(other.edge_list, self.edge_list)
+        if len(self.edge_store) != len(other.edge_store) or len(self.edge_handles) != len(other.edge_handles):
+            return False
+        for e, handles in self.edge_handles.items():
+            if len(other.edge_handles.get(e, ())) != len(handles):
+                return False
+        return True
         
     ## 辺のリストの内容が同じ時Trueを返す。
     #  順序は同じでなくてもよい。
@@ -97,24 +177,13 @@ class Graph:
         if (len(edges1) != len(edges2)):
             return False
 
-        copy1: list[Edge] = list(edges1)
-        copy2: list[Edge] = list(edges2)
-
-        while copy1:
-            e = copy1[0]
-            if e in copy2:
-                copy1.remove(e)
-                copy2.remove(e)
-            else:
-                return False
-
-        return True
+        return Counter(edges1) == Counter(edges2)
 
     def __hash__(self):
         result = 17
 
         listHash = 0
-        for e in self.edge_list:
+        for e in self.edge_store.values():
             listHash += hash(e)
         result = 31 * result + listHash
 
@@ -127,22 +196,18 @@ class Graph:
     def copy_instance(g: 'Graph') -> 'Graph':
         new_graph = Graph()
 
-        org_list = g.edge_list
-        for e in org_list:
+        for e in g.edge_generator():
             new_graph.add_edge(e)
 
         return new_graph
 
     ## グラフの包含を調べる。
+    #  同じ辺が複数あるときは、その数も含んでいるかを調べる。
     #  @param g 指定グラフ。
     #  @return このグラフが指定グラフを含んでいるときTrue。
     def contains_graph(self, g: 'Graph') -> bool:
-        if g.is_empty():
-            return True
-
-        e_list: list[Edge] = g.edge_list
-        for e in e_list:
-            if e not in self.edge_list:
+        for e, handles in g.edge_handles.items():
+            if len(self.edge_handles.get(e, ())) < len(handles):
                 return False
 
         return True
@@ -150,14 +215,14 @@ class Graph:
     ## グラフが空のときTrueを返す。
     #  @return グラフが空のときTrue。
     def is_empty(self) -> bool:
-        return not self.edge_list
+        return not self.edge_store
 
     ## グラフに含まれる辺の総コストを返す。
     #  @return 総コスト。
     def get_total_cost(self) -> Decimal:
         sum = Decimal(0)
 
-        for e in self.edge_list:
+        for e in self.edge_store.values():
             sum += e.get_cost()
         return sum
 
@@ -166,52 +231,42 @@ class Graph:
     #  @param node 指定ノード。
     #  @return 指定ノードにつながったノード。
     def get_node_from_node(self, node: int) -> int | None:
-        for e in self.edge_list:
-            n = e.get_paired_node(node)
-            if n is not None:
-                return n
-
-        return None
+        edges: dict[int, Edge] | None = self.incidence.get(node)
+        if not edges:
+            return None
+        return next(iter(edges.values())).get_paired_node(node)
 
     ## 指定のノードを含んでいるかを返す。
     #  @param node 指定のノード。
     #  @return 指定のノードを含む時True。
     def contains_node(self, node: int) -> bool:
-        for n in self.node_set:
-            if n == node:
-                return True
-        return False
+        return node in self.node_set
 
     ## 指定の辺を含んでいるかを返す。
     #  @param edge 指定の辺。
     #  @return 指定の辺を含む時True。
     def contains_edge(self, edge: Edge) -> bool:
-        return edge in self.edge_list
+        return edge in self.edge_handles
 
-    ## 辺の情報からノードのセットを再作成する。
+    ## 接続辺の索引からノードのセットを再作成する。
     def refresh_node_set(self) -> None:
-        self.node_set.clear()
-
-        for e in self.edge_list:
-            self.node_set.add(e.get_node1())
-            self.node_set.add(e.get_node2())
+        self.node_set = set(self.incidence)
 
     ## 指定グラフをマージする。
     #  @param graph マージするグラフ。
     def merge_graph(self, graph: 'Graph') -> None:
-        self.edge_list.extend(graph.edge_list)
-        self.refresh_node_set()
+        for e in list(graph.edge_generator()):
+            self.add_edge(e)
 
     ## このグラフが連結グラフのときTrueを返す。空グラフのときはFalseを返す。
     #  @return このグラフが連結グラフのときTrue。空グラフのときはFalse。
     def is_connected(self) -> bool:
-        if not self.edge_list:
+        if not self.edge_store:
             return False
 
-        self.refresh_node_set()
         searched_node: deque[int] = deque()
         unsearched_node: list[int] = list(self.get_copy_of_nodes())
-        unsearched_edge: list[Edge] = list(self.edge_list)
+        unsearched_edge: list[Edge] = list(self.edge_store.values())
 
         node: int = unsearched_node[0]
         searched_node.appendleft(node)
@@ -249,19 +304,8 @@ class Graph:
         if not self.is_connected():
             return False
 
-        degree_map: dict[int, int] = dict()
-
-        self.refresh_node_set()
-        for n in self.get_copy_of_nodes():
-            degree_map[n] = 0
-
-        for e in self.edge_list:
-            if e.get_node1() >= 0 and e.get_node2() >= 0:
-                degree_map[e.get_node1()] += 1
-                degree_map[e.get_node2()] += 1
-
-        for node in degree_map.keys():
-            if degree_map[node] % 2 != 0:
+        for d in self.degree.values():
+            if d % 2 != 0:
                 return False
         return True
 
@@ -269,40 +313,38 @@ class Graph:
     #  @param edge 調べる辺。
     #  @return 指定の辺がこのグラフに含まれている数。
     def get_number_of_edge(self, edge: Edge) -> int:
-        counter: int = 0
-        for e in self.edge_list:
-            if e == edge:
-                counter += 1
-        return counter
+        return len(self.edge_handles.get(edge, ()))
 
     ## ノードとそのノードの次数の辞書を返す。
     #  @return ノードとそのノードの次数の辞書。
+    #  ノードは現在の辺の並びで最初に現れる順に並ぶ。
     def get_degree_map(self) -> dict[int, int]:
         degree_map: dict[int, int] = dict()
-        for e in self.edge_list:
-            node1: int = e.get_node1()
-            node2: int = e.get_node2()
-            if node1 in degree_map:
-                degree_map[node1] += 1
-            else:
-                degree_map[node1] = 1
-            if node2 in degree_map:
-                degree_map[node2] += 1
-            else:
-                degree_map[node2] = 1
+        for e in self.edge_store.values():
+            for node in (e.get_node1(), e.get_node2()):
+                if node not in degree_map:
+                    degree_map[node] = self.degree[node]
         return degree_map
 
+    ## ノードが現在の辺の並びで最初に現れる位置を返す。
+    #  get_degree_map()のノードはこの位置の順に並ぶ。
+    #  @param node 対象のノード。
+    #  @return (最初に現れる辺のハンドル, 辺の1番目の端点のとき0、2番目のとき1)のタプル。
+    #  @exception KeyError ノードが無いとき。
+    def get_node_position(self, node: int) -> tuple[int, int]:
+        handle: int = next(iter(self.incidence[node]))
+        return (handle, 0 if self.edge_store[handle].get_node1() == node else 1)
+
     ## 枝線(次数1のノードを含む辺)を抜き出し、 その枝線をこのグラフから削除する。
     #  再帰的には処理しないので、処理後に新たに枝線が発生する可能性がある。
     #  @return 枝線の集合グラフ。
     def pick_up_branch_and_remove(self) -> 'Graph':
-        degree_map: dict[int, int] = self.get_degree_map()
         branch_graph = Graph()
-        for i in degree_map.keys():
-            if degree_map[i] == 1:
-                branch_graph.add_edge(self.get_edge_list_by_node(i)[0])
+        for i, d in self.get_degree_map().items():
+            if d == 1:
+                branch_graph.add_edge(next(iter(self.incidence[i].values())))
 
-        for e in branch_graph.edge_list:
+        for e in list(branch_graph.edge_generator()):
             self.remove_edge(e)
 
         return branch_graph
\ No newline at end of file
@@ -4,6 +4,8 @@ import fileinput
 
 from edge import Edge
 from alias_graph import AliasGraph
+from node_name_table import NodeNameTable
+from union_find import UnionFind
 
 def read_data_list(data_list_file: str) -> list[str]:
     files: list[str] = []
@@ -13,13 +15,13 @@ def read_data_list(data_list_file: str) -> list[str]:
             files.append(line_data.strip())
     return files
 
-def generate_graph_from_files(data_files: list[str]) -> tuple[AliasGraph | None, Decimal, list[str]]:
+def generate_graph_from_files(data_files: list[str]) -> tuple[AliasGraph | None, Decimal, NodeNameTable]:
     graph = AliasGraph()
     transfer_list: list[set[int]] = []
     big_cost, node_list = load_data(graph, data_files, transfer_list)
     big_cost *= 5
     if big_cost < 0:
-        return None, big_cost, []
+        return None, big_cost, NodeNameTable()
 
     set_alias(graph, transfer_list, node_list)
     return graph, big_cost, node_list
@@ -28,10 +30,10 @@ def generate_graph_from_files(data_files: list[str]) -> tuple[AliasGraph | None,
 #  @param graph 読み出し先のグラフ。
 #  @param data_file グラフデータのファイルパスの文字列。
 #  @param transfer_list 同じとみなすノードのリスト
-#  @return 読み出しに成功したときTrue。
-def load_data(graph: AliasGraph, data_files: list[str], transfer_list: list[set[int]]) -> tuple[Decimal, list[str]]:
+#  @return (総コスト, ノード名の対応表)。読み出しに失敗したときは総コストが負の値。
+def load_data(graph: AliasGraph, data_files: list[str], transfer_list: list[set[int]]) -> tuple[Decimal, NodeNameTable]:
     graph.clear()
-    node_list: list[str] = []
+    node_list = NodeNameTable()
     transfer_list.clear()
     total_cost = Decimal(0)
 
@@ -43,7 +45,7 @@ def load_data(graph: AliasGraph, data_files: list[str], transfer_list: list[set[
                     continue
                 elif len(line_data) != 3:
                     print(f'不正なデータがあります: {read_line}', file=sys.stderr)
-                    return Decimal(-1), []
+                    return Decimal(-1), NodeNameTable()
 
                 add_new_nodes_to_nodelist(line_data, node_list)
 
@@ -53,7 +55,7 @@ def load_data(graph: AliasGraph, data_files: list[str], transfer_list: list[set[
                     weight = Decimal(line_data[2])
                     if weight <= 0:
                         print(f'不正なデータがあります(コストは正の値): {read_line}', file=sys.stderr)
-                        return Decimal(-1), []
+                        return Decimal(-1), NodeNameTable()
                     edge = Edge(node_list.index(line_data[0]),
                                 node_list.index(line_data[1]),
                                 weight)
@@ -62,11 +64,12 @@ def load_data(graph: AliasGraph, data_files: list[str], transfer_list: list[set[
         except OSError:
             print('グラフデータの読み込み中にエラーが発生しました。', file=sys.stderr)
             print('(ファイルが存在しない、ファイルが壊れている、UTF-8で保存していない等。)', file=sys.stderr)
-            return Decimal(-1), []
+            return Decimal(-1), NodeNameTable()
         except TypeError:
             print(f'不正なデータがあります(数値データが必要です): {read_line}', file=sys.stderr)
-            return Decimal(-1), []
+            return Decimal(-1), NodeNameTable()
 
+    refresh_transfer(transfer_list)
     return total_cost, node_list
 
 def parse_read_line(read_line: str) -> list[str]:
@@ -79,31 +82,52 @@ def remove_after_hash(s: str) -> str:
         return s[: hash_index]
     return s
 
-def add_new_nodes_to_nodelist(line_data: list[str], node_list: list[str]) -> None:
-    if line_data[0] not in node_list:
-        node_list.append(line_data[0])
-    if line_data[1] not in node_list:
-        node_list.append(line_data[1])
+def add_new_nodes_to_nodelist(line_data: list[str], node_list: NodeNameTable) -> None:
+    node_list.add(line_data[0])
+    node_list.add(line_data[1])
 
-def add_transfer(node1: str, node2: str, transfer_list: list[set[int]], node_list: list[str]) -> None:
+## 同じとみなすノードの組をリストに追加する。
+#  グループの整理はrefresh_transfer()でまとめて行う。
+def add_transfer(node1: str, node2: str, transfer_list: list[set[int]], node_list: NodeNameTable) -> None:
     transfer_list.append({node_list.index(node1), node_list.index(node2)})
-    refresh_transfer(transfer_list)
 
+## 共通のノードを持つセットを1つにまとめる。
+#  先頭のセットから順に、既存のグループに併合するか新しいグループにする。
+#  グループはUnion-Findで引くので、セットの数に対してほぼ線形時間で処理できる。
+#  まとめたセットは、元になったセットのうち最も前にあるものの位置に並ぶ。
+#  @param transfer_list 同じとみなすノードのセットのリスト。
 def refresh_transfer(transfer_list: list[set[int]]) -> None:
-    i = 0
-    j = i + 1
-    while i < len(transfer_list) - 1:
-        while j < len(transfer_list):
-            if transfer_list[i] & transfer_list[j]:
-                transfer_list[i] |= transfer_list[j]
-                transfer_list.pop(j)
-                i = 0
-                j = i
-            j += 1
-        i += 1
-        j = i + 1
-
-def set_alias(graph: AliasGraph, transfer_list: list[set[int]], node_list: list[str]) -> None:
+    union_find = UnionFind()
+    groups: list[set[int] | None] = []  # 併合されたグループはNone
+    group_of_root: dict[int, int] = dict()  # 代表元 -> groupsのインデックス
+
+    for s in transfer_list:
+        touched: set[int] = set()
+        for node in s:
+            found = union_find.find(node)
+            if found in group_of_root:
+                touched.add(group_of_root.pop(found))
+
+        if touched:
+            indexes = sorted(touched)
+            index = indexes[0]
+            groups[index] |= s
+            for j in indexes[1:]:
+                groups[index] |= groups[j]
+                groups[j] = None
+        else:
+            index = len(groups)
+            groups.append(s)
+
+        root: int | None = None
+        for node in s:
+            root = union_find.find(node) if root is None else union_find.union(root, node)
+        if root is not None:
+            group_of_root[root] = index
+
+    transfer_list[:] = [g for g in groups if g is not None]
+
+def set_alias(graph: AliasGraph, transfer_list: list[set[int]], node_list: NodeNameTable) -> None:
     for s in transfer_list:
         alias_node = len(node_list)
         node_list.append(str(alias_node))
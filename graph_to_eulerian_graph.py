@@ -1,21 +1,29 @@
+from collections import Counter
+from decimal import Decimal
+
 from edge import Edge
 from alias_graph import AliasGraph
 import matching
 import dijkstra
 from dijkstra_path import DijkstraPath
+from search_graph import SearchGraph
+from distance_table import DistanceTable
 
 ## グラフをオイラーグラフに変換する。
-#  @param graph 元のグラフ。
+#  @param graph   元のグラフ。
+#  @param nearest 指定したときは、奇数次数の各ノードから近い順にこの数のノードとの間の辺だけでマッチングを始める。
+#                 省略したときは奇数次数のノードの完全グラフでマッチングする。
+#  @param jobs    完全グラフの最短距離を探索するプロセスの数。
 #  @return 変換後のオイラーグラフ。
 #  @exception ValueError 元のグラフが連結グラフではないとき。
 #                        オイラーグラフへの変換に失敗したとき。
-def graph_to_eulerian_graph(graph: AliasGraph) -> AliasGraph:
+def graph_to_eulerian_graph(graph: AliasGraph, nearest: int | None = None, jobs: int = 1) -> AliasGraph:
     if not graph.is_connected():
         raise ValueError('分断ネット')
 
     initial_graph = AliasGraph.copy_instance(graph)
     branch_list: list[AliasGraph] = pick_up_branch_and_remove(graph)
-    make_euler_graph(graph)
+    make_euler_graph(graph, nearest, jobs)
     restore_branch_with_duplicating(graph, branch_list)
     # 枝線を復帰してから無駄線を削除しないと、枝線がフローティングになることがある。
     cut_extra_route(graph, initial_graph)
@@ -31,21 +39,17 @@ def graph_to_eulerian_graph(graph: AliasGraph) -> AliasGraph:
 #  @param graph 対象グラフ。
 #  @return 枝線の集合グラフのリスト。
 def pick_up_branch_and_remove(graph: AliasGraph) -> list[AliasGraph]:
-    branch_list: list[AliasGraph] = []
-    while True:
-        branch_graph: AliasGraph = graph.pick_up_branch_and_remove()
-        if branch_graph.is_empty():
-            break
-        branch_list.append(branch_graph)
-    return branch_list
+    return graph.pick_up_branches_and_remove()
 
 ## オイラーグラフに変換する。
-#  @param graph 元グラフ。
-def make_euler_graph(graph: AliasGraph) -> None:
+#  @param graph   元グラフ。
+#  @param nearest マッチングを始める近傍ノードの数。省略したときは完全グラフでマッチングする。
+#  @param jobs    完全グラフの最短距離を探索するプロセスの数。
+def make_euler_graph(graph: AliasGraph, nearest: int | None = None, jobs: int = 1) -> None:
     local_graph = AliasGraph.copy_instance(graph)
     odd_nodes: list[int] = get_odd_degree_nodes(graph)
     if odd_nodes:
-        make_degree_even(odd_nodes, local_graph)
+        make_degree_even(odd_nodes, local_graph, nearest, jobs)
     replace_graph(graph, local_graph)
 
 ## 次数が奇数の頂点リストを返す。
@@ -62,41 +66,141 @@ def get_odd_degree_nodes(graph: AliasGraph) -> list[int]:
 ## オイラーグラフを作成する。
 #  @param odd_nodes 次数が奇数の頂点リスト。
 #  @param graph 元グラフ。
-def make_degree_even(odd_nodes: list[int], graph: AliasGraph) -> None:
-    c_graph = make_complete_graph(odd_nodes, graph)
-    minimum_cost_perfect_matching: AliasGraph = matching.blossom(c_graph)
-    add_matching_to_graph(minimum_cost_perfect_matching, graph)
+#  @param nearest マッチングを始める近傍ノードの数。省略したときは完全グラフでマッチングする。
+#  @param jobs    完全グラフの最短距離を探索するプロセスの数。
+#  最短経路の探索用グラフは最初に一度だけ構築する。
+#  マッチングの追加で増えるのは既存の辺の複製だけなので、最短経路は変わらない。
+def make_degree_even(odd_nodes: list[int], graph: AliasGraph, nearest: int | None = None, jobs: int = 1) -> None:
+    search_graph = SearchGraph(graph)
+    if nearest is None:
+        distance_table = DistanceTable(search_graph, odd_nodes, jobs)
+        c_graph = make_complete_graph(odd_nodes, graph, search_graph, distance_table)
+        minimum_cost_perfect_matching: AliasGraph = matching.blossom(c_graph)
+        add_matching_to_graph(minimum_cost_perfect_matching, graph, search_graph, distance_table)
+    else:
+        minimum_cost_perfect_matching = match_nearest_odd_nodes(odd_nodes, search_graph, nearest)
+        add_matching_to_graph(minimum_cost_perfect_matching, graph, search_graph)
 
 ## 指定ノードの完全グラフを返す。
 #  ノード間の最短距離をコストにする。
 #  @param nodes ノードリスト。
 #  @param graph コストを参照するグラフ。
+#  @param search_graph graphから構築した探索用グラフ。省略したときはgraphから構築する。
+#  @param distance_table nodesの最小コストの表。省略したときは構築する。
 #  @return 完全グラフ。
-def make_complete_graph(nodes: list[int], graph: AliasGraph) -> AliasGraph:
+def make_complete_graph(nodes: list[int], graph: AliasGraph, search_graph: SearchGraph | None = None, distance_table: DistanceTable | None = None) -> AliasGraph:
+    if distance_table is None:
+        if search_graph is None:
+            search_graph = SearchGraph(graph)
+        distance_table = DistanceTable(search_graph, nodes)
     c_graph = AliasGraph()
 
     for i in range(len(nodes) - 1):
-        costs = dijkstra.single_source_shortest_length(graph, nodes[i], nodes[i + 1:])
-        for j in range(len(costs)):
-            c_graph.add_edge(Edge(nodes[i], nodes[i + 1 + j], costs[j]))
+        for j in range(i + 1, len(nodes)):
+            c_graph.add_edge(Edge(nodes[i], nodes[j], distance_table.get_cost(nodes[i], nodes[j])))
     return c_graph
 
+## 近傍ノードとの間の辺だけから始めて、完全グラフと同じコストの最小コスト完全マッチングを返す。
+#  各ノードから近い順にk個のノードとの間に最短距離をコストにした辺を張ってマッチングする。
+#  完全マッチングが無いときはkを2倍にしてやり直す。
+#  マッチングの双対解で被約費用が負になる辺が完全グラフに残っていれば、その辺を追加して解き直す。
+#  残っていなければ、完全グラフでも最適なマッチングになっている。
+#  コストが同じマッチングが複数あるときは、完全グラフのときと異なるマッチングを返すことがある。
+#  @param nodes ノードリスト。
+#  @param search_graph 探索用グラフ。
+#  @param k 最初に辺を張る近傍ノードの数。
+#  @return マッチング結果のグラフ。
+def match_nearest_odd_nodes(nodes: list[int], search_graph: SearchGraph, k: int) -> AliasGraph:
+    goal_ids: set[int] = set(nodes)
+    k = max(1, min(k, len(nodes) - 1))
+    c_graph = AliasGraph()
+    known_costs: dict[tuple[int, int], Decimal] = dict()  # 最短距離を求めたノードの組 -> 最短距離
+    c_edges: set[tuple[int, int]] = set()  # c_graphに張った辺のノードの組
+    radius: dict[int, Decimal] = dict()  # ノード -> 近傍探索の半径。近傍外のノードまでの最短距離はこれ以上
+
+    def add_candidate_edge(u: int, v: int, cost: Decimal) -> None:
+        key = (u, v) if u < v else (v, u)
+        known_costs[key] = cost
+        if key not in c_edges:
+            c_edges.add(key)
+            c_graph.add_edge(Edge(key[0], key[1], cost))
+
+    while True:
+        for u in nodes:
+            nearest_goals, radius[u] = dijkstra.get_nearest_goals(search_graph, u, goal_ids, k)
+            for v, cost in nearest_goals:
+                add_candidate_edge(u, v, cost)
+        try:
+            result = matching.blossom_with_dual(c_graph)
+            break
+        except ValueError:
+            if k >= len(nodes) - 1:
+                raise
+            k = min(2 * k, len(nodes) - 1)
+
+    while True:
+        minimum_cost_perfect_matching, reduced_cost, potential = result
+        # ポテンシャルの大きい順に調べ、下界の被約費用が負になりえない組は打ち切る。
+        order: list[int] = sorted(nodes, key=lambda n: potential[n], reverse=True)
+        unknown_pairs: dict[int, list[int]] = dict()
+        added: bool = False
+        for u in order:
+            threshold: Decimal = radius[u] - potential[u]
+            for v in order:
+                if potential[v] <= threshold:
+                    break
+                if v == u:
+                    continue
+                key = (u, v) if u < v else (v, u)
+                if key in c_edges:
+                    continue
+                cost: Decimal | None = known_costs.get(key)
+                if cost is None:
+                    if u < v and reduced_cost(u, v, max(radius[u], radius[v])) < 0:
+                        unknown_pairs.setdefault(u, []).append(v)
+                elif reduced_cost(u, v, cost) < 0:
+                    add_candidate_edge(u, v, cost)
+                    added = True
+        for u, vs in unknown_pairs.items():
+            costs: list[Decimal] = dijkstra.single_source_shortest_length(search_graph, u, vs)
+            for v, cost in zip(vs, costs):
+                key = (u, v)
+                known_costs[key] = cost
+                if reduced_cost(u, v, cost) < 0:
+                    add_candidate_edge(u, v, cost)
+                    added = True
+        if not added:
+            return minimum_cost_perfect_matching
+        result = matching.blossom_with_dual(c_graph)
+
 ## マッチングをグラフに追加する。
+#  マッチングの各辺の両端を結ぶ最短経路上の辺をgraphに追加する。
+#  経路上の辺は、同じノードの組を一度だけgraphから検索して使い回す。
+#  追加するのは既存の辺の複製だけなので、検索結果は変わらない。
 #  @param matching 追加元のマッチング。
 #  @param graph 追加先のグラフ。
-def add_matching_to_graph(matching: AliasGraph, graph: AliasGraph) -> None:
+#  @param search_graph graphから構築した探索用グラフ。省略したときはgraphから構築する。
+#  @param distance_table マッチングのノードを含む最小コストの表。指定したときは表の最短経路を使い、再探索しない。
+def add_matching_to_graph(matching: AliasGraph, graph: AliasGraph, search_graph: SearchGraph | None = None, distance_table: DistanceTable | None = None) -> None:
+    if search_graph is None and distance_table is None:
+        search_graph = SearchGraph(graph)
+    edge_index: dict[tuple[int, int], Edge | None] = dict()  # 経路上のノードの組 -> graphの辺
     for edge in matching.edge_generator():
         start: int = matching.get_alias_node(edge.get_node1())
         goal: int  = matching.get_alias_node(edge.get_node2())
 
-        d_path: DijkstraPath = dijkstra.get_shortest_path(graph, start, goal)
-        node1: int = 0
-        node2: int = d_path[0].get_id()
-
-        for i in range(1, len(d_path)):
-            node1 = node2
-            node2 = d_path[i].get_id()
-            e = graph.get_edge_by_nodes(node1, node2)
+        path: list[int]
+        if distance_table is not None:
+            path = distance_table.get_path(start, goal)
+        else:
+            d_path: DijkstraPath = dijkstra.get_shortest_path(search_graph, start, goal)
+            path = [d_path[i].get_id() for i in range(len(d_path))]
+
+        for i in range(1, len(path)):
+            key: tuple[int, int] = (path[i - 1], path[i])
+            if key not in edge_index:
+                edge_index[key] = graph.get_edge_by_nodes(key[0], key[1])
+            e = edge_index[key]
             if e is not None:
                 graph.add_edge(e)
 
@@ -121,18 +225,13 @@ def restore_branch_with_duplicating(graph: AliasGraph, branch_graph_list: list[A
         graph.merge_graph(branch_graph)
 
 ## 余分な路線を省く。
+#  同じ辺ごとに、graphでの数と初期データでの数の差を数え、差の偶数部分の本数をgraphから削除する。
+#  削除するのは同じ辺のうち先に追加されたもの。
 #  @param graph 編集するグラフ。
 #  @param initial_graph 初期データグラフ。
 def cut_extra_route(graph: AliasGraph, initial_graph: AliasGraph) -> None:
-    waste_graph = AliasGraph.copy_instance(graph)
-    for edge in initial_graph.edge_generator():
-        waste_graph.remove_edge(edge)
-
-    while not waste_graph.is_empty():
-        e = waste_graph.get_edge(0)
-        e_number: int = waste_graph.get_number_of_edge(e)
-        if e_number >= 2:
-            for i in range(e_number // 2 * 2):
-                graph.remove_edge(e)
-        for i in range(e_number):
-            waste_graph.remove_edge(e)
+    surplus: Counter[Edge] = Counter(graph.edge_generator())
+    surplus.subtract(initial_graph.edge_generator())
+    for e, e_number in surplus.items():
+        for i in range(e_number // 2 * 2):
+            graph.remove_edge(e)
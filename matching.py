@@ -1,33 +1,53 @@
+from collections.abc import Callable
 from decimal import Decimal
 
 from edge import Edge
 from alias_graph import AliasGraph
-from matching_graph import MatchingGraph
+from sparse_matching_graph import SparseMatchingGraph
 from blossom_matching import BlossomMatching
 
 ## Blossomアルゴリズムのマッチング結果を返す。
 #  @param complete_graph 入力の完全グラフ。
+#  @param fixed_point    Trueのときコストを整数に変換して計算する。結果はDecimalで計算したときと同じ。
 #  @return マッチング結果のグラフ。
-def blossom(complete_graph: AliasGraph) -> AliasGraph:
-    num_vertex: int = complete_graph.get_node_size()
-    num_edge: int   = complete_graph.get_edge_size()
+def blossom(complete_graph: AliasGraph, fixed_point: bool = True) -> AliasGraph:
+    return blossom_with_dual(complete_graph, fixed_point)[0]
 
-    nodes: set[int]           = complete_graph.get_copy_of_nodes()
+## Blossomアルゴリズムのマッチング結果と、最適性の確認に使う双対解を返す。
+#  入力グラフは完全グラフでなくてもよい。
+#  被約費用が負にならない辺は、入力グラフに追加してもマッチングの最適性を変えない。
+#  @param graph       入力グラフ。
+#  @param fixed_point Trueのときコストを整数に変換して計算する。結果はDecimalで計算したときと同じ。
+#  @return (マッチング結果のグラフ, 被約費用の関数, ノードのポテンシャルの辞書)のタプル。
+#          被約費用の関数は2つのノードとその間のコストを受け取る。ノードは入力グラフのもの。
+#          ポテンシャルは被約費用の下界に使う。コストcの辺{u, v}の被約費用は c - ポテンシャル(u) - ポテンシャル(v) 以上。
+#  @exception ValueError 入力グラフに完全マッチングが無いとき。
+def blossom_with_dual(graph: AliasGraph, fixed_point: bool = True) -> tuple[AliasGraph, Callable[[int, int, Decimal], Decimal], dict[int, Decimal]]:
+    num_vertex: int = graph.get_node_size()
+    num_edge: int   = graph.get_edge_size()
+
+    nodes: set[int]           = graph.get_copy_of_nodes()
     tmp_to_org_map: list[int] = list(nodes)
+    org_to_tmp_map: dict[int, int] = {n: i for i, n in enumerate(tmp_to_org_map)}
 
-    g = MatchingGraph(num_vertex)
+    g = SparseMatchingGraph(num_vertex)
     cost: list[Decimal] = [Decimal(0)] * num_edge
-    for edge in complete_graph.edge_generator():
-        u: int = tmp_to_org_map.index(complete_graph.get_alias_node(edge.get_node1()))
-        v: int = tmp_to_org_map.index(complete_graph.get_alias_node(edge.get_node2()))
+    for edge in graph.edge_generator():
+        u: int = org_to_tmp_map[graph.get_alias_node(edge.get_node1())]
+        v: int = org_to_tmp_map[graph.get_alias_node(edge.get_node2())]
         c: Decimal = edge.get_cost()
         g.add_edge(u, v)
         cost[g.get_edge_index(u, v)] = c
     m = BlossomMatching(g)
-    solution: tuple[list[int], Decimal] = m.solve_minimum_cost_perfect_matching(cost)
+    solution: tuple[list[int], Decimal] = m.solve_minimum_cost_perfect_matching(cost, fixed_point)
     matching: list[int] = solution[0]
     matching_graph = AliasGraph()
     for it in matching:
         e: tuple[int, int] = g.get_edge(it)
         matching_graph.add_edge(Edge(tmp_to_org_map[e[0]], tmp_to_org_map[e[1]], Decimal(1)))
-    return matching_graph
+
+    def reduced_cost(u: int, v: int, c: Decimal) -> Decimal:
+        return m.get_reduced_cost(org_to_tmp_map[u], org_to_tmp_map[v], c)
+
+    potential: dict[int, Decimal] = {n: m.get_potential(i) for i, n in enumerate(tmp_to_org_map)}
+    return (matching_graph, reduced_cost, potential)
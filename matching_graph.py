@@ -11,6 +11,7 @@ class MatchingGraph:
         self.m: int = 0  # Number of edges
         self.adj_mat: list[list[bool]] = [[False for _ in range(n)] for _ in range(n)]  # Adjacency matrix
         self.adj_list: list[list[int]] = [[] for _ in range(n)]  # Adjacency lists
+        self.adj_edge_list: list[list[int]] = [[] for _ in range(n)]  # Indices of the edges in the same order as adj_list
         self.edges: list[tuple[int, int]] = []  # Array of edges
         self.edge_index: list[list[int]] = [[-1 for _ in range(n)] for _ in range(n)]  # Indices of the edges
         for it in edges:
@@ -41,6 +42,10 @@ class MatchingGraph:
     
         return self.edge_index[u][v]
     
+    # Returns true if there is an edge between u and v
+    def has_edge(self, u: int, v: int) -> bool:
+        return self.adj_mat[u][v]
+
     # Adds a new vertex to the graph
     def add_vertex(self) -> None:
         for a, e in zip(self.adj_mat, self.edge_index):
@@ -50,6 +55,7 @@ class MatchingGraph:
         self.adj_mat.append([False for _ in range(self.n)])
         self.edge_index.append([-1 for _ in range(self.n)])
         self.adj_list.append([])
+        self.adj_edge_list.append([])
     
     # Adds a new edge to the graph
     def add_edge(self, u: int, v: int) -> None:
@@ -63,6 +69,8 @@ class MatchingGraph:
         self.adj_mat[v][u] = True
         self.adj_list[u].append(v)
         self.adj_list[v].append(u)
+        self.adj_edge_list[u].append(self.m)
+        self.adj_edge_list[v].append(self.m)
     
         self.edges.append((u, v))
         self.edge_index[u][v] = self.m
@@ -76,6 +84,13 @@ class MatchingGraph:
     
         return self.adj_list[v]
     
+    # Returns the indices of the edges incident to a vertex, in the same order as get_adj_list
+    def get_adj_edge_list(self, v: int) -> list[int]:
+        if v >= self.n:
+            raise IndexError('Error: vertex does not exist')
+    
+        return self.adj_edge_list[v]
+    
     # Returns the graph's adjacency matrix
     def get_adj_mat(self) -> list[list[bool]]:
         return self.adj_mat
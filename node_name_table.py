@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+
+## ノード名とノードIDの対応表。
+#  ノードIDは登録順の連番で、ノード名のリストと同じように扱える。
+#  ノード名からIDへの変換は辞書で行う。
+class NodeNameTable:
+    def __init__(self):
+        self.names: list[str] = []  # ID -> ノード名
+        self.ids: dict[str, int] = dict()  # ノード名 -> ID
+
+    ## ノード名を登録し、そのIDを返す。
+    #  登録済みのときは既存のIDを返す。
+    #  @param name ノード名。
+    #  @return ノードID。
+    def add(self, name: str) -> int:
+        node_id: int | None = self.ids.get(name)
+        if node_id is None:
+            node_id = len(self.names)
+            self.names.append(name)
+            self.ids[name] = node_id
+        return node_id
+
+    ## ノード名を末尾に追加する。
+    #  同じ名前が登録済みでも追加する。名前からIDへの変換は最初のIDを返す。
+    #  @param name ノード名。
+    def append(self, name: str) -> None:
+        self.ids.setdefault(name, len(self.names))
+        self.names.append(name)
+
+    ## ノード名のIDを返す。
+    #  @param name ノード名。
+    #  @return ノードID。
+    #  @exception ValueError 登録されていないとき。
+    def index(self, name: str) -> int:
+        node_id: int | None = self.ids.get(name)
+        if node_id is None:
+            raise ValueError(f'{name!r} is not in NodeNameTable')
+        return node_id
+
+    ## ノードIDのノード名を返す。
+    #  @param node_id ノードID。
+    #  @return ノード名。
+    def __getitem__(self, node_id: int) -> str:
+        return self.names[node_id]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.names!r})'
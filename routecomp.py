@@ -8,11 +8,13 @@ if __name__ == '__main__':
     parser.add_argument('-s', '--start', default='', help='始点')
     parser.add_argument('-g', '--goal', default='', help='終点')
     parser.add_argument('--show_edge', action='store_true', help='ルートを構成するエッジの表示')
+    parser.add_argument('--nearest', type=EulerianTask.parse_positive_int, metavar='K', help='奇数次数の各ノードから近いK個のノードとの間の辺だけでマッチングを始める (大規模データ向け)')
+    parser.add_argument('-j', '--jobs', type=EulerianTask.parse_positive_int, default=1, metavar='N', help='奇数次数のノード間の最短距離をNプロセスで探索する')
     parser.add_argument('-l', '--listfile', help='データファイルを記述したファイル')
     parser.add_argument('FILE', nargs='*', help='データファイル (-lオプション使用時は無視)')
     args = parser.parse_args()
 
-    task = EulerianTask()
+    task = EulerianTask(args.nearest, args.jobs)
     if args.listfile is not None:
         task.run_from_list(args.listfile, args.start, args.goal, args.show_edge)
     else:
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from decimal import Decimal
+
+from edge import Edge
+from alias_graph import AliasGraph
+
+## 最短経路探索用にエイリアスを解決済みのグラフ。
+#  AliasGraphから一度だけ構築し、同じ状態のグラフへの探索で使い回す。
+#  構築後は変更しないこと。元のAliasGraphを変更しても反映されない。
+class SearchGraph:
+    ## AliasGraphから探索用グラフを構築する。
+    #  @param graph 元のグラフ。
+    def __init__(self, graph: AliasGraph):
+        self.edges: list[Edge] = []  # エイリアスを解決した辺 (元のグラフの順)
+        self.edge_lists: dict[int, list[Edge]] = dict()  # エイリアスノード -> 接続する辺 (ノードが辺に初めて現れた順)
+        for edge in graph.edge_generator():
+            node1: int = graph.get_alias_node(edge.get_node1())
+            node2: int = graph.get_alias_node(edge.get_node2())
+            self.add_edge(Edge(node1, node2, edge.get_cost()))
+
+    ## 辺を追加する。構築時だけに使う。
+    #  @param edge エイリアスを解決した辺。
+    def add_edge(self, edge: Edge) -> None:
+        self.edges.append(edge)
+        self.edge_lists.setdefault(edge.get_node1(), []).append(edge)
+        self.edge_lists.setdefault(edge.get_node2(), []).append(edge)
+
+    ## pickle用に、辺を(ノード, ノード, コスト)のタプルのリストにして返す。
+    #  他のプロセスに渡すときに、Edgeと辺リストの重複を送らない。
+    #  @return 辺のタプルのリスト。
+    def __getstate__(self) -> list[tuple[int, int, Decimal]]:
+        return [(e.get_node1(), e.get_node2(), e.get_cost()) for e in self.edges]
+
+    ## pickleした辺のタプルのリストから、同じ順序で再構築する。
+    #  @param state 辺のタプルのリスト。
+    def __setstate__(self, state: list[tuple[int, int, Decimal]]) -> None:
+        self.edges = []
+        self.edge_lists = dict()
+        for node1, node2, cost in state:
+            self.add_edge(Edge(node1, node2, cost))
+
+    ## ノードのイテレータを返す。
+    #  @return ノードが辺に初めて現れた順のイテレータ。
+    def node_iterator(self) -> Iterator[int]:
+        return iter(self.edge_lists)
+
+    ## 指定ノードに接続する辺のリストを返す。
+    #  呼び出し側で変更しないこと。
+    #  @param node エイリアスノード。
+    #  @return 接続する辺のリスト。
+    def get_edge_list(self, node: int) -> list[Edge]:
+        return self.edge_lists[node]
+
+    ## 指定のノードを含んでいるかを返す。
+    #  @param node エイリアスノード。
+    #  @return 指定のノードを含む時True。
+    def contains_node(self, node: int) -> bool:
+        return node in self.edge_lists
+
+    ## ノードの数を返す。
+    #  @return ノードの数。
+    def __len__(self) -> int:
+        return len(self.edge_lists)
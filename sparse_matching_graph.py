@@ -0,0 +1,95 @@
+# A sparse graph with the same interface as MatchingGraph
+# Instead of the adjacency and edge index matrices, it keeps adjacency lists and a dictionary keyed by the endpoints
+# so the memory grows with the number of edges rather than the square of the number of vertices
+
+class SparseMatchingGraph:
+    # n is the number of vertices
+    # edges is a list of pairs representing the edges (default = empty list)
+    def __init__(self, n: int = 0, edges: list[tuple[int, int]] = None):
+        if edges is None:
+            edges = []
+        self.n: int = n  # Number of vertices
+        self.m: int = 0  # Number of edges
+        self.adj_list: list[list[int]] = [[] for _ in range(n)]  # Adjacency lists
+        self.adj_edge_list: list[list[int]] = [[] for _ in range(n)]  # Indices of the edges in the same order as adj_list
+        self.edges: list[tuple[int, int]] = []  # Array of edges
+        self.edge_index: dict[tuple[int, int], int] = dict()  # Indices of the edges, keyed by (smaller endpoint, larger endpoint)
+        for it in edges:
+            self.add_edge(it[0], it[1])
+
+    # Returns the number of vertices
+    def get_num_vertices(self) -> int:
+        return self.n
+
+    # Returns the number of edges
+    def get_num_edges(self) -> int:
+        return self.m
+
+    # Given the edge's index, returns its endpoints as a pair
+    def get_edge(self, e: int) -> tuple[int, int]:
+        if e >= len(self.edges):
+            raise IndexError('Error: edge does not exist')
+
+        return self.edges[e]
+
+    # Given the endpoints, returns the index
+    def get_edge_index(self, u: int, v: int) -> int:
+        if u >= self.n or v >= self.n:
+            raise IndexError('Error: vertex does not exist')
+
+        index: int | None = self.edge_index.get((u, v) if u < v else (v, u))
+        if index is None:
+            raise IndexError('Error: edge does not exist')
+
+        return index
+
+    # Returns true if there is an edge between u and v
+    def has_edge(self, u: int, v: int) -> bool:
+        return ((u, v) if u < v else (v, u)) in self.edge_index
+
+    # Adds a new vertex to the graph
+    def add_vertex(self) -> None:
+        self.n += 1
+        self.adj_list.append([])
+        self.adj_edge_list.append([])
+
+    # Adds a new edge to the graph
+    def add_edge(self, u: int, v: int) -> None:
+        if u >= self.n or v >= self.n:
+            raise IndexError('Error: vertex does not exist')
+
+        key = (u, v) if u < v else (v, u)
+        if key in self.edge_index:
+            return
+
+        self.adj_list[u].append(v)
+        self.adj_list[v].append(u)
+        self.adj_edge_list[u].append(self.m)
+        self.adj_edge_list[v].append(self.m)
+
+        self.edges.append((u, v))
+        self.edge_index[key] = self.m
+        self.m += 1
+
+    # Returns the adjacency list of a vertex
+    def get_adj_list(self, v: int) -> list[int]:
+        if v >= self.n:
+            raise IndexError('Error: vertex does not exist')
+
+        return self.adj_list[v]
+
+    # Returns the indices of the edges incident to a vertex, in the same order as get_adj_list
+    def get_adj_edge_list(self, v: int) -> list[int]:
+        if v >= self.n:
+            raise IndexError('Error: vertex does not exist')
+
+        return self.adj_edge_list[v]
+
+    # Builds and returns the graph's adjacency matrix
+    # This is for compatibility with MatchingGraph and uses memory quadratic in the number of vertices
+    def get_adj_mat(self) -> list[list[bool]]:
+        adj_mat = [[False for _ in range(self.n)] for _ in range(self.n)]
+        for u, v in self.edges:
+            adj_mat[u][v] = True
+            adj_mat[v][u] = True
+        return adj_mat
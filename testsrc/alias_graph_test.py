@@ -3,6 +3,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import unittest
+import random
 from decimal import Decimal
 from edge import Edge
 from alias_graph import AliasGraph
@@ -34,6 +35,21 @@ class AliasGraphTest(unittest.TestCase):
         sut.add_edge(Edge(2, 3, Decimal(2)))
         self.assertFalse(sut.is_connected())
 
+    def test_get_connected_components(self):
+        # エイリアスノードの連結成分を返す
+        sut = AliasGraph()
+        sut.add_edge(Edge(0, 1, Decimal(1)))
+        sut.add_edge(Edge(2, 3, Decimal(2)))
+        sut.add_edge(Edge(4, 5, Decimal(2)))
+        sut.set_alias_node(1, 10)
+        sut.set_alias_node(2, 10)
+        self.assertEqual(sut.get_connected_components(), [[0, 10, 3], [4, 5]])
+        self.assertFalse(sut.is_connected())
+
+        sut.clear()
+        self.assertEqual(sut.get_connected_components(), [])
+        self.assertFalse(sut.is_connected())
+
     def test_get_edge(self):
         # 指定した位置の辺を返す
         sut = AliasGraph()
@@ -362,6 +378,27 @@ class AliasGraphTest(unittest.TestCase):
         g.add_edge(e4)
         self.assertFalse(sut.contains_graph(g))
 
+    def test_contains_graph_multiplicity(self):
+        # 同じ辺の数も含んでいるかを判定する
+        sut = AliasGraph()
+        g   = AliasGraph()
+        e1 = Edge(1, 2, Decimal('10'))
+        e2 = Edge(2, 3, Decimal('10'))
+        sut.add_edge(e1)
+        sut.add_edge(e2)
+        sut.add_edge(Edge(2, 1, Decimal('10')))
+        g.add_edge(e1)
+        g.add_edge(e1)
+        self.assertTrue(sut.contains_graph(g))
+
+        g.add_edge(e1)
+        self.assertFalse(sut.contains_graph(g))
+        self.assertFalse(sut == g)
+
+        g.remove_edge(e1)
+        g.add_edge(e2)
+        self.assertTrue(sut == g)
+
     def test_total_cost(self):
         # 総コストを返す
         sut = AliasGraph()
@@ -553,6 +590,61 @@ class AliasGraphTest(unittest.TestCase):
         sut.set_alias_node(0, 3)
         self.assertTrue(sut.is_euler_graph())
 
+    def test_is_euler_graph_incremental(self):
+        # 辺の追加と削除、エイリアスの変更の後も、毎回作り直したグラフと同じ結果になる
+        sut = AliasGraph()
+        e1  = Edge(0, 1, Decimal('10'))
+        e2  = Edge(1, 2, Decimal('10'))
+        e3  = Edge(2, 0, Decimal('10'))
+        e4  = Edge(3, 4, Decimal('10'))
+        e5  = Edge(4, 5, Decimal('10'))
+        e6  = Edge(5, 3, Decimal('10'))
+        e7  = Edge(2, 3, Decimal('10'))
+
+        def check():
+            self.assertEqual(sut.is_euler_graph(), sut.generate_alias_node_graph().is_euler_graph())
+            self.assertEqual(sut.get_odd_node_set(), {n for n, d in sut.get_degree_map().items() if d % 2 != 0})
+
+        self.assertFalse(sut.is_euler_graph())
+        for e in (e1, e2, e3):
+            sut.add_edge(e)
+            check()
+        self.assertTrue(sut.is_euler_graph())
+        for e in (e4, e5, e6):
+            sut.add_edge(e)
+            check()
+        self.assertFalse(sut.is_euler_graph())
+
+        sut.add_edge(e7)
+        sut.add_edge(e7)
+        check()
+        self.assertTrue(sut.is_euler_graph())
+
+        sut.remove_edge(e7)
+        check()
+        self.assertFalse(sut.is_euler_graph())
+        sut.remove_edge(e7)
+        check()
+
+        sut.set_alias_node(0, 3)
+        check()
+        self.assertTrue(sut.is_euler_graph())
+
+        copied = AliasGraph.copy_instance(sut)
+        self.assertTrue(copied.is_euler_graph())
+
+        sut.remove_alias(0)
+        check()
+        self.assertFalse(sut.is_euler_graph())
+        self.assertTrue(copied.is_euler_graph())
+
+        sut.clear()
+        self.assertFalse(sut.is_euler_graph())
+        sut.add_edge(e1)
+        sut.add_edge(e1)
+        check()
+        self.assertTrue(sut.is_euler_graph())
+
     def test_number_of_edge(self):
         # ある辺が何本含まれているかを返す
         sut = AliasGraph()
@@ -590,6 +682,75 @@ class AliasGraphTest(unittest.TestCase):
         self.assertEqual(branch_graph.get_edge_size(), 1)
         self.assertTrue(branch_graph.contains_node(3))
 
+    def test_pick_up_branches_and_remove(self):
+        # 段ごとの枝線を1回で取り出す。繰り返し取り出したときと同じ結果になる
+        graph = AliasGraph()
+        graph.add_edge(Edge(0, 1, Decimal('1')))
+        graph.add_edge(Edge(1, 2, Decimal('1')))
+        graph.add_edge(Edge(0, 2, Decimal('1')))
+        graph.add_edge(Edge(2, 3, Decimal('1')))
+        graph.add_edge(Edge(3, 4, Decimal('1')))
+        graph.add_edge(Edge(4, 5, Decimal('1')))
+        graph.add_edge(Edge(7, 6, Decimal('1')))
+        graph.add_edge(Edge(8, 9, Decimal('1')))
+        graph.set_alias_node(1, 20)
+        graph.set_alias_node(7, 20)
+        graph.set_alias_node(4, 21)
+        graph.set_alias_node(8, 21)
+        exp_graph = AliasGraph.copy_instance(graph)
+        exp_list = []
+        while True:
+            branch_graph = exp_graph.pick_up_branch_and_remove()
+            if branch_graph.is_empty():
+                break
+            exp_list.append(branch_graph)
+
+        act_list = graph.pick_up_branches_and_remove()
+
+        self.assertEqual(len(act_list), 3)
+        self.assertEqual(graph, exp_graph)
+        for act, exp in zip(act_list, exp_list):
+            self.assertEqual(list(act.edge_generator()), list(exp.edge_generator()))
+            self.assertEqual(act.alias_map, exp.alias_map)
+        self.assertEqual(list(act_list[0].edge_generator()), [Edge(4, 5, Decimal('1')), Edge(7, 6, Decimal('1')), Edge(8, 9, Decimal('1'))])
+
+    def test_pick_up_branches_and_remove_random(self):
+        # 辺の削除でノードの順序が変わっても、繰り返し取り出したときと同じ順になる
+        rng = random.Random(1)
+        for _ in range(50):
+            graph = AliasGraph()
+            n = rng.randrange(4, 30)
+            edges = [(0, 1), (1, 2), (2, 0)] + [(rng.randrange(i), i) for i in range(3, n)]
+            edges += [tuple(rng.sample(range(n), 2)) for _ in range(rng.randrange(3))]
+            rng.shuffle(edges)
+            for u, v in edges:
+                graph.add_edge(Edge(u, v, Decimal('1')) if rng.random() < 0.5 else Edge(v, u, Decimal('1')))
+            for real in rng.sample(range(n), rng.randrange(3)):
+                graph.set_alias_node(real, 100)
+            exp_graph = AliasGraph.copy_instance(graph)
+            exp_list = []
+            while True:
+                branch_graph = exp_graph.pick_up_branch_and_remove()
+                if branch_graph.is_empty():
+                    break
+                exp_list.append(branch_graph)
+
+            act_list = graph.pick_up_branches_and_remove()
+
+            self.assertEqual(len(act_list), len(exp_list))
+            self.assertEqual(list(graph.edge_generator()), list(exp_graph.edge_generator()))
+            for act, exp in zip(act_list, exp_list):
+                self.assertEqual(list(act.edge_generator()), list(exp.edge_generator()))
+
+    def test_pick_up_branches_and_remove_line(self):
+        # 1本の辺だけのグラフは両端が次数1でも1本だけ取り出す
+        graph = AliasGraph()
+        graph.add_edge(Edge(0, 1, Decimal('1')))
+        act_list = graph.pick_up_branches_and_remove()
+        self.assertEqual(len(act_list), 1)
+        self.assertEqual(act_list[0].get_edge_size(), 1)
+        self.assertTrue(graph.is_empty())
+
     def test_pick_up_branch_and_remove_alias(self):
         # エイリアスを介した2本の枝線を取り出す
         graph = AliasGraph()
@@ -708,3 +869,30 @@ class AliasGraphTest(unittest.TestCase):
         act = sut.get_alias_dict()
         self.assertEqual(act[10], {0, 1})
         self.assertEqual(act[11], {2, 3, 4})
+
+    def test_get_alias_dict_after_update(self):
+        # エイリアス情報を変更するとエイリアスの辞書も更新する
+        sut = AliasGraph()
+        e1 = Edge(0, 1, Decimal('1'))
+        sut.add_edge(e1)
+        sut.add_edge(Edge(2, 3, Decimal('1')))
+        sut.set_alias_node(0, 10)
+        sut.set_alias_node(2, 10)
+        self.assertEqual(sut.get_alias_dict(), {10: {0, 2}})
+
+        sut.set_alias_node(3, 10)
+        self.assertEqual(sut.get_alias_dict(), {10: {0, 2, 3}})
+
+        sut.remove_edge(e1)
+        sut.add_edge(Edge(0, 4, Decimal('1')))
+        self.assertEqual(sut.get_alias_dict(), {10: {2, 3}})
+
+        g = AliasGraph()
+        g.add_edge(Edge(5, 6, Decimal('1')))
+        g.set_alias_node(5, 11)
+        sut.merge_graph(g)
+        self.assertEqual(sut.get_alias_dict(), {10: {2, 3}, 11: {5}})
+        self.assertEqual(len(sut.get_edge_list_by_node(11)), 1)
+
+        sut.clear()
+        self.assertEqual(sut.get_alias_dict(), {})
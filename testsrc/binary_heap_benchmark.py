@@ -0,0 +1,48 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import random
+import timeit
+from decimal import Decimal
+from binary_heap import BinaryHeap
+
+## BinaryHeap.change_keyのマイクロベンチマーク。
+#  python binary_heap_benchmark.py で実行する。
+
+## 以前のchange_key(removeしてからinsertする)を使うヒープ。比較用。
+class RemoveInsertHeap(BinaryHeap):
+    def change_key(self, k: Decimal, s: int) -> None:
+        self.remove(s)
+        self.insert(k, s)
+
+## ダイクストラ法と同じように、全要素を無限大で入れてからキーを減らしつつ取り出す。
+#  @param heap_class ヒープのクラス。
+#  @param size 要素数。
+#  @param seed 乱数のシード。
+def run_decrease_key(heap_class: type[BinaryHeap], size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    heap = heap_class()
+    for s in range(size):
+        heap.insert(Decimal('Infinity'), s)
+    keys: dict[int, Decimal] = {}
+    while len(heap) > 0:
+        u = heap.delete_min()
+        base = keys.get(u, Decimal(0))
+        for _ in range(3):
+            v = rng.randrange(size)
+            if heap.contains_satellite(v):
+                k = base + Decimal(rng.randrange(1, 100))
+                if k < keys.get(v, Decimal('Infinity')):
+                    keys[v] = k
+                    heap.change_key(k, v)
+
+def main() -> None:
+    size = 20000
+    repeat = 3
+    for heap_class in (RemoveInsertHeap, BinaryHeap):
+        t = min(timeit.repeat(lambda: run_decrease_key(heap_class, size, 1), number=1, repeat=repeat))
+        print(f'{heap_class.__name__:>16}: {t:.3f} s')
+
+if __name__ == '__main__':
+    main()
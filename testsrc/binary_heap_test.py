@@ -3,6 +3,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import unittest
+import random
 from decimal import Decimal
 from binary_heap import BinaryHeap
 
@@ -88,3 +89,48 @@ class BinaryHeapTest(unittest.TestCase):
         sut.insert(Decimal('0.1'), 1)
         self.assertTrue(sut.contains_satellite(1))
         self.assertFalse(sut.contains_satellite(2))
+
+    def test_change_key_decrease(self):
+        # キーを小さくすると先に取り出される
+        satelittes = (4, 2, 6, 3, 0)
+        keys = (Decimal('0.7'), Decimal('0.2'), Decimal('0.4'), Decimal('0.8'), Decimal('0.3'))
+        sut = BinaryHeap()
+        for k, s in zip(keys, satelittes):
+            sut.insert(k, s)
+        sut.change_key(Decimal('0.1'), 3)
+        sut.change_key(Decimal('0.25'), 4)
+        self.assertEqual([sut.delete_min() for _ in range(5)], [3, 2, 4, 0, 6])
+
+    def test_change_key_increase(self):
+        # キーを大きくすると後に取り出される
+        satelittes = (4, 2, 6, 3, 0)
+        keys = (Decimal('0.7'), Decimal('0.2'), Decimal('0.4'), Decimal('0.8'), Decimal('0.3'))
+        sut = BinaryHeap()
+        for k, s in zip(keys, satelittes):
+            sut.insert(k, s)
+        sut.change_key(Decimal('0.9'), 2)
+        sut.change_key(Decimal('0.5'), 0)
+        self.assertEqual([sut.delete_min() for _ in range(5)], [6, 0, 4, 3, 2])
+
+    def test_change_key_tie(self):
+        # キーを小さくした要素は、キーが等しい要素を追い越さない。削除して挿入したときとは取り出す順が異なる
+        sut = BinaryHeap()
+        for s, k in enumerate((Decimal('2'), Decimal('3'), Decimal('2'))):
+            sut.insert(k, s)
+        sut.change_key(Decimal('2'), 1)
+        self.assertEqual([sut.delete_min() for _ in range(3)], [0, 2, 1])
+
+    def test_change_key_random(self):
+        # キーの変更を繰り返しても昇順に取り出される
+        rng = random.Random(1)
+        sut = BinaryHeap()
+        keys: dict[int, Decimal] = {}
+        for s in range(200):
+            keys[s] = Decimal(rng.randrange(1000))
+            sut.insert(keys[s], s)
+        for _ in range(1000):
+            s = rng.randrange(200)
+            keys[s] = Decimal(rng.randrange(1000))
+            sut.change_key(keys[s], s)
+        result = [keys[sut.delete_min()] for _ in range(200)]
+        self.assertEqual(result, sorted(keys.values()))
@@ -3,9 +3,11 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import unittest
+import random
 from decimal import Decimal
 from blossom_matching import BlossomMatching
 from matching_graph import MatchingGraph
+from sparse_matching_graph import SparseMatchingGraph
 
 class BlossomMatchingTest(unittest.TestCase):
     def test_min_weight_matching(self):
@@ -116,3 +118,78 @@ class BlossomMatchingTest(unittest.TestCase):
             if (p[0] == x and p[1] == y) or (p[0] == y and p[1] == x):
                 return True
         return False
+
+    def test_min_weight_matching_sparse(self):
+        # 疎なグラフでも密なグラフと同じマッチングを返す
+        edges = [(0, 1), (0, 2), (1, 2), (1, 5), (1, 6), (2, 3), (2, 4), (3, 4),
+                 (4, 6), (4, 7), (4, 8), (5, 6), (6, 7), (7, 8), (7, 9), (8, 9)]
+        costs = [10, 4, 3, 2, 2, 1, 2, 5, 4, 1, 3, 1, 2, 3, 2, 1]
+        dense = MatchingGraph(10, edges)
+        sparse = SparseMatchingGraph(10, edges)
+        cost = [Decimal(c) for c in costs]
+        exp = BlossomMatching(dense).solve_minimum_cost_perfect_matching(cost)
+        act = BlossomMatching(sparse).solve_minimum_cost_perfect_matching(cost)
+        self.assertEqual(act, exp)
+
+    def test_min_weight_matching_tie(self):
+        # コストが等しいマッチングが複数あるときは、次数が等しい頂点をBinaryHeapの順に取り出して選ぶ
+        edges = [(0, 2), (0, 5), (1, 4), (2, 3), (3, 5)]
+        cost = [Decimal(1)] * len(edges)
+        act = BlossomMatching(SparseMatchingGraph(6, edges)).solve_minimum_cost_perfect_matching(cost)
+        self.assertEqual(act, ([0, 2, 4], Decimal(3)))
+
+    def test_get_cost_scale(self):
+        # コストを整数にする倍率は、小数点以下の最大桁数に合わせた10の累乗の2倍
+        self.assertEqual(BlossomMatching.get_cost_scale([Decimal('1.5'), Decimal('2'), Decimal('0.25')]), 200)
+        self.assertIsNone(BlossomMatching.get_cost_scale([Decimal('1'), Decimal('Infinity')]))
+
+    def test_min_weight_matching_fixed_point(self):
+        # 整数で計算しても同じマッチングを返す
+        rng = random.Random(1)
+        for n in (4, 8, 12, 16):
+            edges = [(u, v) for u in range(n) for v in range(u + 1, n)]
+            for _ in range(10):
+                cost = [Decimal(rng.randrange(1, 300)) / 10 for _ in edges]
+                exp = BlossomMatching(SparseMatchingGraph(n, edges)).solve_minimum_cost_perfect_matching(cost)
+                act = BlossomMatching(SparseMatchingGraph(n, edges)).solve_minimum_cost_perfect_matching(cost, True)
+                self.assertEqual(act, exp)
+
+    def test_reduced_cost(self):
+        # 最適解の双対解で、全ての辺の被約費用は負にならず、マッチングの辺では0になる
+        rng = random.Random(2)
+        for fixed_point in (False, True):
+            for n in (4, 8, 12):
+                edges = [(u, v) for u in range(n) for v in range(u + 1, n)]
+                for _ in range(5):
+                    cost = [Decimal(rng.randrange(-50, 300)) / 10 for _ in edges]
+                    m = BlossomMatching(SparseMatchingGraph(n, edges))
+                    matching, _ = m.solve_minimum_cost_perfect_matching(cost, fixed_point)
+                    for e, (u, v) in enumerate(edges):
+                        reduced = m.get_reduced_cost(u, v, cost[e])
+                        self.assertGreaterEqual(reduced, 0)
+                        self.assertGreaterEqual(reduced, cost[e] - m.get_potential(u) - m.get_potential(v))
+                        if e in matching:
+                            self.assertEqual(reduced, 0)
+
+    def test_min_weight_matching_brute_force(self):
+        # 全探索で求めた最小コストと一致する
+        rng = random.Random(2)
+        for n in (4, 6, 8):
+            for _ in range(20):
+                edges = [(u, v) for u in range(n) for v in range(u + 1, n) if rng.random() < 0.7 or v == u + 1]
+                cost = [Decimal(rng.randrange(1, 50)) for _ in edges]
+                costs = {e: c for e, c in zip(edges, cost)}
+                exp = self.brute_force(list(range(n)), costs)
+                act = BlossomMatching(SparseMatchingGraph(n, edges)).solve_minimum_cost_perfect_matching(cost)
+                self.assertEqual(act[1], exp)
+
+    def brute_force(self, nodes: list[int], costs: dict[tuple[int, int], Decimal]) -> Decimal:
+        if not nodes:
+            return Decimal(0)
+        best = Decimal('Infinity')
+        u = nodes[0]
+        for v in nodes[1:]:
+            if (u, v) in costs:
+                rest = [w for w in nodes[1:] if w != v]
+                best = min(best, costs[(u, v)] + self.brute_force(rest, costs))
+        return best
@@ -9,8 +9,12 @@ from dijkstra import single_source_shortest_length
 from dijkstra import get_shortest_path
 from dijkstra import set_costs_to_goals
 from dijkstra import make_node_list
+from dijkstra import generate_dijkstra_path
+from dijkstra import get_nearest_goals
 from edge import Edge
 from alias_graph import AliasGraph
+from search_graph import SearchGraph
+from dijkstra_node import DijkstraNode
 
 class DijkstraTest(unittest.TestCase):
     def setUp(self):
@@ -66,6 +70,25 @@ class DijkstraTest(unittest.TestCase):
         g.add_edge(Edge(2, 3, Decimal(1)))
         self.assertEqual(get_shortest_length(g, 0, 3), 11)
 
+    def test_get_shortest_length_parallel(self):
+        # 並行する辺があるときは探索で通った辺のコストを使う
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal(1)))
+        g.add_edge(Edge(0, 1, Decimal(5)))
+        g.add_edge(Edge(1, 2, Decimal(2)))
+        self.assertEqual(get_shortest_length(g, 0, 2), 3)
+        path = get_shortest_path(g, 2, 0)
+        self.assertEqual([n.get_id() for n in path.path], [2, 1, 0])
+        self.assertEqual(path.get_edge(0), Edge(1, 2, Decimal(2)))
+        self.assertEqual(path.get_edge(1), Edge(0, 1, Decimal(1)))
+
+    def test_get_weight(self):
+        # 辺が無いノードへのコストは例外になる
+        node = DijkstraNode(0, [Edge(0, 1, Decimal(3)), Edge(1, 0, Decimal(2))])
+        self.assertEqual(node.get_weight(1), 2)
+        with self.assertRaises(ValueError):
+            node.get_weight(2)
+
     def test_single_source_shortest_length(self):
         goals = list(range(8))
         self.assertEqual(single_source_shortest_length(self.g, 0, goals), [0, 2, 3, 5, 4, 5, 7, 8])
@@ -103,3 +126,91 @@ class DijkstraTest(unittest.TestCase):
     def test_make_node_list(self):
         l = make_node_list(self.g)
         self.assertEqual(len(l), 8)
+
+    def test_make_node_list_alias(self):
+        # エイリアスノードをIDにしてノードと辺を登録する
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        g.set_alias_node(1, 4)
+        g.set_alias_node(2, 4)
+        nodes = make_node_list(g)
+        self.assertEqual(list(nodes.keys()), [0, 4, 3])
+        self.assertEqual(len(nodes[4].edge_list), 2)
+        self.assertEqual(get_shortest_length(g, 0, 3), 2)
+
+    def test_search_graph_reuse(self):
+        # 構築済みの探索用グラフを繰り返し使う
+        sg = SearchGraph(self.g)
+        goals = list(range(8))
+        for start in range(8):
+            self.assertEqual(single_source_shortest_length(sg, start, goals),
+                             single_source_shortest_length(self.g, start, goals))
+        path = get_shortest_path(sg, 0, 7)
+        self.assertEqual([n.get_id() for n in path.path], [0, 4, 5, 6, 7])
+
+    def test_set_costs_to_goals_lazy(self):
+        # 見つけたノードだけを探索中ノードリストに入れてもコストは同じ
+        for start in range(8):
+            exp = [n.get_score() for n in set_costs_to_goals(self.g, start, list(range(8)))]
+            act = [n.get_score() for n in set_costs_to_goals(self.g, start, list(range(8)), lazy=True)]
+            self.assertEqual(act, exp)
+
+    def test_set_costs_to_goals_tie(self):
+        # スコアが等しいノードは先に見つけたものから取り出す
+        g = AliasGraph()
+        g.add_edge(Edge(0, 2, Decimal('1')))
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(1, 3, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        for lazy in (False, True):
+            goals = set_costs_to_goals(g, 0, [3], lazy)
+            self.assertEqual([n.get_id() for n in generate_dijkstra_path(goals[0]).path], [0, 2, 3])
+
+    def test_set_costs_to_goals_lazy_tie(self):
+        # コストが等しい経路が複数あっても、見つけたノードだけを入れたときと同じ経路を選ぶ
+        g = AliasGraph()
+        w = 6
+        for y in range(w):
+            for x in range(w):
+                if x + 1 < w:
+                    g.add_edge(Edge(y * w + x, y * w + x + 1, Decimal('1')))
+                if y + 1 < w:
+                    g.add_edge(Edge(y * w + x, (y + 1) * w + x, Decimal('1')))
+        goals = list(range(w * w))
+        for start in (0, 7, 20):
+            exp = [generate_dijkstra_path(n).path for n in set_costs_to_goals(g, start, goals)]
+            act = [generate_dijkstra_path(n).path for n in set_costs_to_goals(g, start, goals, lazy=True)]
+            self.assertEqual([[n.get_id() for n in p] for p in act], [[n.get_id() for n in p] for p in exp])
+
+    def test_set_costs_to_goals_lazy_missing(self):
+        # 存在しないゴールはNone、到達できないゴールは無限大
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        goals = set_costs_to_goals(g, 0, [1, 3, 9], lazy=True)
+        self.assertEqual(goals[0].get_score(), 1)
+        self.assertTrue(goals[1].get_score().is_infinite())
+        self.assertIsNone(goals[2])
+
+    def test_set_costs_to_goals_lazy_neighborhood(self):
+        # 長い路線上の近いゴールを探索する
+        g = AliasGraph()
+        for i in range(100):
+            g.add_edge(Edge(i, i + 1, Decimal('1')))
+        goals = set_costs_to_goals(g, 0, [2], lazy=True)
+        self.assertEqual(goals[0].get_score(), 2)
+        path = generate_dijkstra_path(goals[0])
+        self.assertEqual([n.get_id() for n in path.path], [0, 1, 2])
+
+    def test_get_nearest_goals(self):
+        # 近い順にk個のゴールと探索半径を返す
+        g = AliasGraph()
+        for i in range(100):
+            g.add_edge(Edge(i, i + 1, Decimal('1')))
+        nearest, radius = get_nearest_goals(g, 50, {10, 48, 50, 53, 90}, 2)
+        self.assertEqual(nearest, [(48, Decimal('2')), (53, Decimal('3'))])
+        self.assertEqual(radius, Decimal('3'))
+        nearest, radius = get_nearest_goals(g, 50, {10, 48, 50, 53, 90}, 10)
+        self.assertEqual([n for n, _ in nearest], [48, 53, 10, 90])
+        self.assertTrue(radius.is_infinite())
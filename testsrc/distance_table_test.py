@@ -0,0 +1,102 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import unittest
+import random
+from decimal import Decimal
+from edge import Edge
+from alias_graph import AliasGraph
+from search_graph import SearchGraph
+from distance_table import DistanceTable
+import dijkstra
+
+class DistanceTableTest(unittest.TestCase):
+    def setUp(self):
+        self.g = AliasGraph()
+        self.g.add_edge(Edge(0, 1, Decimal('4')))
+        self.g.add_edge(Edge(0, 2, Decimal('1')))
+        self.g.add_edge(Edge(0, 3, Decimal('3')))
+        self.g.add_edge(Edge(1, 2, Decimal('2')))
+        self.g.add_edge(Edge(2, 4, Decimal('5')))
+
+    def test_get_cost(self):
+        # ノード間の最小コストを返す
+        table = DistanceTable(SearchGraph(self.g), [1, 3, 4])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.get_cost(1, 3), Decimal('6'))
+        self.assertEqual(table.get_cost(3, 1), Decimal('6'))
+        self.assertEqual(table.get_cost(1, 4), Decimal('7'))
+        self.assertEqual(table.get_cost(4, 3), Decimal('9'))
+        self.assertEqual(table.get_cost(4, 4), Decimal('0'))
+
+    def test_get_path(self):
+        # 再探索せずに最短経路を返す。逆向きは逆順になる
+        table = DistanceTable(SearchGraph(self.g), [1, 3, 4])
+        self.assertEqual(table.get_path(1, 3), [1, 2, 0, 3])
+        self.assertEqual(table.get_path(3, 1), [3, 0, 2, 1])
+        self.assertEqual(table.get_path(3, 4), [3, 0, 2, 4])
+        self.assertEqual(table.get_path(4, 4), [4])
+
+    def test_unreachable(self):
+        # 到達できないときは無限大と空の経路
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        table = DistanceTable(SearchGraph(g), [0, 1, 3])
+        self.assertEqual(table.get_cost(0, 1), Decimal('1'))
+        self.assertTrue(table.get_cost(0, 3).is_infinite())
+        self.assertEqual(table.get_path(3, 0), [])
+
+    def test_random_graph(self):
+        # 最小コストと経路のコストがダイクストラ法の結果と一致する
+        rng = random.Random(1)
+        g = AliasGraph()
+        for i in range(1, 60):
+            g.add_edge(Edge(rng.randrange(i), i, Decimal(rng.randrange(1, 50))))
+        for _ in range(40):
+            u, v = rng.sample(range(60), 2)
+            if g.get_edge_by_nodes(u, v) is None:
+                g.add_edge(Edge(u, v, Decimal(rng.randrange(1, 50))))
+        sg = SearchGraph(g)
+        nodes = rng.sample(range(60), 12)
+        table = DistanceTable(sg, nodes)
+        for u in nodes:
+            costs = dijkstra.single_source_shortest_length(sg, u, nodes)
+            for v, exp in zip(nodes, costs):
+                self.assertEqual(table.get_cost(u, v), exp)
+                path = table.get_path(u, v)
+                self.assertEqual((path[0], path[-1]), (u, v))
+                cost = sum((g.get_edge_by_nodes(a, b).get_cost() for a, b in zip(path, path[1:])), Decimal(0))
+                self.assertEqual(cost, exp)
+
+    def test_get_path_tie(self):
+        # コストが等しい経路が複数あるときも、dijkstra.get_shortest_pathと同じ経路を返す
+        g = AliasGraph()
+        w = 8
+        for y in range(w):
+            for x in range(w):
+                if x + 1 < w:
+                    g.add_edge(Edge(y * w + x, y * w + x + 1, Decimal('1')))
+                if y + 1 < w:
+                    g.add_edge(Edge(y * w + x, (y + 1) * w + x, Decimal('1')))
+        sg = SearchGraph(g)
+        nodes = random.Random(3).sample(range(w * w), 16)
+        table = DistanceTable(sg, nodes)
+        for i, u in enumerate(nodes):
+            for v in nodes[i + 1:]:
+                d_path = dijkstra.get_shortest_path(sg, u, v)
+                self.assertEqual(table.get_path(u, v), [d_path[k].get_id() for k in range(len(d_path))])
+
+    def test_jobs(self):
+        # 複数のプロセスで探索しても同じ表になる
+        rng = random.Random(2)
+        g = AliasGraph()
+        for i in range(1, 80):
+            g.add_edge(Edge(rng.randrange(i), i, Decimal(rng.randrange(1, 50)) / 10))
+        sg = SearchGraph(g)
+        nodes = rng.sample(range(80), 16)
+        exp = DistanceTable(sg, nodes)
+        act = DistanceTable(sg, nodes, jobs=2)
+        self.assertEqual(act.costs, exp.costs)
+        self.assertEqual(act.parents, exp.parents)
@@ -52,6 +52,20 @@ class EdgeTest(unittest.TestCase):
         self.assertTrue(e1 == e2)
         self.assertEqual(hash(e1), hash(e2))
 
+    def test_hash_scale(self):
+        # 表記の異なる同じ値のコストは同じハッシュコードを返す
+        e1 = Edge(1, 2, Decimal('10'))
+        e2 = Edge(2, 1, Decimal('10.0'))
+
+        self.assertTrue(e1 == e2)
+        self.assertEqual(hash(e1), hash(e2))
+
+    def test_get_key(self):
+        # 端点の向きをそろえたキーを返す
+        self.assertEqual(Edge(2, 1, Decimal('1')).get_key(), (1, 2))
+        self.assertEqual(Edge(1, 2, Decimal('1')).get_key(), (1, 2))
+        self.assertFalse(hasattr(Edge(1, 2, Decimal('1')), '__dict__'))
+
     def test_equals_value(self):
         # 同じ内容の辺を同じ辺とみなす
         e1 = Edge(1, 2, Decimal('10'))
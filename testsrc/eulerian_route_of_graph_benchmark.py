@@ -0,0 +1,37 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import timeit
+from decimal import Decimal
+from edge import Edge
+from alias_graph import AliasGraph
+from eulerian_route_of_graph import generate_initial_euler_circuit
+
+## generate_initial_euler_circuitのベンチマーク。
+#  python eulerian_route_of_graph_benchmark.py で実行する。
+#  部分ループが深く入れ子になるグラフで、処理時間が辺の数にほぼ比例することを確かめる。
+
+## 0-1-2-...-nの各辺に三角形を付けたグラフを作る。部分ループがn段入れ子になる。
+#  @param n 三角形の数。
+#  @return グラフ。
+def make_nested_triangles(n: int) -> AliasGraph:
+    g = AliasGraph()
+    for i in range(n):
+        g.add_edge(Edge(i, i + 1, Decimal('1')))
+        g.add_edge(Edge(i + 1, n + 1 + i, Decimal('1')))
+        g.add_edge(Edge(n + 1 + i, i, Decimal('1')))
+    return g
+
+def main() -> None:
+    repeat = 3
+    base: float | None = None
+    for n in (1000, 2000, 4000, 8000, 16000):
+        g = make_nested_triangles(n)
+        t = min(timeit.repeat(lambda: generate_initial_euler_circuit(g, 0), number=1, repeat=repeat))
+        if base is None:
+            base = t
+        print(f'{n:>6} triangles: {t:.3f} s (x{t / base:.1f})')
+
+if __name__ == '__main__':
+    main()
@@ -6,12 +6,98 @@ import unittest
 from decimal import Decimal
 from edge import Edge
 from alias_graph import AliasGraph
+from eulerian_route_of_graph import generate_initial_euler_circuit
 from eulerian_route_of_graph import generate_loop_route
 from eulerian_route_of_graph import merge_euler_circuit
 from eulerian_route_of_graph import select_start_node
 from eulerian_route_of_graph import add_alias_connect
 
 class EulerianRouteOfGraphTest(unittest.TestCase):
+    def test_generate_initial_euler_circuit(self):
+        # 部分ループを最後に現れる位置へ挿入してオイラールートを作る
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(1, 2, Decimal('1')))
+        g.add_edge(Edge(2, 0, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        g.add_edge(Edge(3, 4, Decimal('1')))
+        g.add_edge(Edge(4, 2, Decimal('1')))
+        g.add_edge(Edge(5, 6, Decimal('1')))
+        g.add_edge(Edge(6, 7, Decimal('1')))
+        g.add_edge(Edge(7, 5, Decimal('1')))
+        g.set_alias_node(0, 10)
+        g.set_alias_node(5, 10)
+        route = generate_initial_euler_circuit(g, -1)
+        self.assertEqual(route, [[0, 1], [1, 2], [2, 3], [3, 4], [4, 2], [2, 0], [5, 6], [6, 7], [7, 5]])
+        self.assertEqual(g.get_edge_size(), 9)
+
+    def test_generate_initial_euler_circuit_start(self):
+        # 始点を指定してオイラールートを作る
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(1, 2, Decimal('1')))
+        g.add_edge(Edge(2, 0, Decimal('1')))
+        g.add_edge(Edge(3, 4, Decimal('1')))
+        g.add_edge(Edge(4, 5, Decimal('1')))
+        g.add_edge(Edge(5, 3, Decimal('1')))
+        g.set_alias_node(0, 6)
+        g.set_alias_node(3, 6)
+        route = generate_initial_euler_circuit(g, 4)
+        self.assertEqual(g.get_alias_node(route[0][0]), 4)
+        self.assertEqual(g.get_alias_node(route[-1][1]), 4)
+        for i in range(1, len(route)):
+            self.assertEqual(g.get_alias_node(route[i - 1][1]), g.get_alias_node(route[i][0]))
+        self.assertEqual(len(route), 6)
+
+    def test_generate_initial_euler_circuit_disconnected(self):
+        # 始点から辿れない辺が残るときは例外を出す
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(1, 0, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        g.add_edge(Edge(3, 2, Decimal('1')))
+        with self.assertRaises(ValueError):
+            generate_initial_euler_circuit(g, 0)
+
+    def test_generate_initial_euler_circuit_alias_one(self):
+        # ノード2つをエイリアス設定したときは1本の辺で一周する
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.set_alias_node(0, 2)
+        g.set_alias_node(1, 2)
+        route = generate_initial_euler_circuit(g, 0)
+        self.assertEqual(len(route), 1)
+        self.assertEqual(g.get_alias_node(route[0][0]), 2)
+        self.assertEqual(g.get_alias_node(route[0][1]), 2)
+
+    def test_generate_initial_euler_circuit_via_alias(self):
+        # エイリアスを通って一周する
+        # 1-2=3-1のループ
+        g = AliasGraph()
+        g.add_edge(Edge(1, 2, Decimal('1')))
+        g.add_edge(Edge(3, 1, Decimal('1')))
+        g.set_alias_node(2, 11)
+        g.set_alias_node(3, 11)
+        route = generate_initial_euler_circuit(g, 1)
+        self.assertEqual(route, [[1, 2], [3, 1]])
+
+    def test_generate_initial_euler_circuit_nested(self):
+        # 部分ループが深く入れ子になっても、各部分ループを最後の出現位置の後ろに挿入する
+        # 0-1-2-...-nの各辺に三角形を付けたグラフ。処理時間はeulerian_route_of_graph_benchmark.pyで測る
+        n = 8000
+        g = AliasGraph()
+        for i in range(n):
+            g.add_edge(Edge(i, i + 1, Decimal('1')))
+            g.add_edge(Edge(i + 1, n + 1 + i, Decimal('1')))
+            g.add_edge(Edge(n + 1 + i, i, Decimal('1')))
+        route = generate_initial_euler_circuit(g, 0)
+        self.assertEqual(len(route), 3 * n)
+        exp = [[i, i + 1] for i in range(n)]
+        for i in range(n, 0, -1):
+            exp.append([i, n + i])
+            exp.append([n + i, i - 1])
+        self.assertEqual(route, exp)
+
     def test_generate_loop_route(self):
         g = AliasGraph()
         g.add_edge(Edge(0, 1, Decimal('1')))
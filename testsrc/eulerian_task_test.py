@@ -3,6 +3,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import unittest
+import argparse
 from test.support import captured_stdout
 from decimal import Decimal
 from edge import Edge
@@ -141,6 +142,14 @@ class EulerianTaskTest(unittest.TestCase):
         self.assertFalse(EulerianTask.is_valid_node_name('', node_list))
         self.assertFalse(EulerianTask.is_valid_node_name(None, node_list))
 
+    def test_parse_positive_int(self):
+        # 1以上の整数だけを受け付ける
+        self.assertEqual(EulerianTask.parse_positive_int('1'), 1)
+        self.assertEqual(EulerianTask.parse_positive_int('8'), 8)
+        for value in ('0', '-2', 'a', ''):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                EulerianTask.parse_positive_int(value)
+
     def test_show_start_goal_vv(self):
         # 始点と終点の画面表示
         # 始点も終点も有効
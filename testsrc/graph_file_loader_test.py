@@ -52,3 +52,33 @@ class GraphFileLoaderTest(unittest.TestCase):
         graph_file_loader.refresh_transfer(l)
         self.assertEqual(len(l), 1)
         self.assertEqual(l[0], {0, 1, 2})
+
+    def test_load_data_node_order(self):
+        # ノードIDはファイルに現れた順になる
+        graph = AliasGraph()
+        transfer_list: list[set[int]] = []
+        test_file = os.path.join(os.path.dirname(__file__), 'route_data/graph_file_loader_test.txt')
+        _, node_list = graph_file_loader.load_data(graph, [test_file], transfer_list)
+        self.assertEqual(list(node_list), ['a', 'b', 'c', 'd', 'e', 'f'])
+        self.assertEqual(node_list.index('d'), 3)
+
+    def test_refresh_transfer_bridge(self):
+        # 乗り換えデータを整理する
+        # 後から追加したデータで2つのグループがつながる場合
+        l: list[set[int]] = []
+        l.append({0, 1})
+        l.append({2, 3})
+        l.append({4, 5})
+        l.append({5, 1})
+        graph_file_loader.refresh_transfer(l)
+        self.assertEqual(len(l), 2)
+        self.assertEqual(l[0], {0, 1, 4, 5})
+        self.assertEqual(l[1], {2, 3})
+
+    def test_refresh_transfer_chain(self):
+        # 乗り換えデータを整理する
+        # 多数のデータが1つのグループにまとまる場合
+        l: list[set[int]] = [{i, i + 1} for i in range(1000, 0, -1)]
+        graph_file_loader.refresh_transfer(l)
+        self.assertEqual(len(l), 1)
+        self.assertEqual(l[0], set(range(1, 1002)))
@@ -39,6 +39,34 @@ class GraphTest(unittest.TestCase):
         self.assertIs(sut.get_edge(3), e3)
         self.assertIs(sut.get_edge(4), e2)
 
+    def test_get_edge_after_remove(self):
+        # 辺を削除した後も、残った辺を追加順に返す
+        sut = Graph()
+        edges = [Edge(i, i + 1, Decimal('1')) for i in range(100)]
+        for e in edges:
+            sut.add_edge(e)
+        for e in edges[::3]:
+            sut.remove_edge(e)
+        rest = [e for i, e in enumerate(edges) if i % 3 != 0]
+        self.assertEqual([sut.get_edge(i) for i in range(sut.get_edge_size())], rest)
+        self.assertIs(sut.get_edge(-1), rest[-1])
+        e = Edge(200, 201, Decimal('1'))
+        sut.add_edge(e)
+        self.assertIs(sut.get_edge(len(rest)), e)
+        with self.assertRaises(IndexError):
+            sut.get_edge(len(rest) + 1)
+
+    def test_handle_list_size(self):
+        # 辺の追加と削除を繰り返しても、ハンドルのリストは辺の数の2倍程度に収まる
+        sut = Graph()
+        sut.add_edge(Edge(0, 1, Decimal('1')))
+        e = Edge(1, 2, Decimal('1'))
+        for _ in range(1000):
+            sut.add_edge(e)
+            sut.remove_edge(e)
+        self.assertLessEqual(len(sut.handle_list), 2 * sut.get_edge_size() + 1)
+        self.assertIs(sut.get_edge(0), sut.get_edge(-1))
+
     def test_get_edge_by_real_nodes(self):
         # 指定した頂点を結ぶ辺を返す
         sut = Graph()
@@ -137,6 +165,69 @@ class GraphTest(unittest.TestCase):
         if sut.get_edge_size() == 1:
             self.assertIs(sut.get_edge(0), e2)
 
+    def test_remove_edge_refresh_index(self):
+        # 辺を削除すると接続辺とノードの情報も更新する
+        sut = Graph()
+
+        e1 = Edge(0, 1, Decimal('1'))
+        e2 = Edge(1, 2, Decimal('2'))
+        e3 = Edge(1, 2, Decimal('2'))
+
+        sut.add_edge(e1)
+        sut.add_edge(e2)
+        sut.add_edge(e3)
+
+        sut.remove_edge(e1)
+        self.assertFalse(sut.contains_node(0))
+        self.assertIsNone(sut.get_node_from_node(0))
+        self.assertEqual(sut.get_edge_list_by_node(1), [e2, e3])
+
+        sut.remove_edge(Edge(2, 1, Decimal('2')))
+        self.assertIs(sut.get_edge_by_nodes(2, 1), e3)
+        self.assertEqual(sut.get_node_size(), 2)
+
+    def test_remove_edge_not_exist(self):
+        # 含まれていない辺を削除すると例外を出す
+        sut = Graph()
+        sut.add_edge(Edge(0, 1, Decimal('1')))
+        with self.assertRaises(ValueError):
+            sut.remove_edge(Edge(0, 1, Decimal('2')))
+
+    def test_remove_edge_by_handle(self):
+        # ハンドルを指定して辺を削除する
+        sut = Graph()
+
+        e1 = Edge(0, 1, Decimal('1'))
+        e2 = Edge(0, 1, Decimal('1'))
+        h1 = sut.add_edge(e1)
+        h2 = sut.add_edge(e2)
+        self.assertNotEqual(h1, h2)
+        self.assertIs(sut.get_edge_by_handle(h2), e2)
+        self.assertEqual(sut.get_handle_list_by_node(0), [h1, h2])
+
+        sut.remove_edge_by_handle(h2)
+        self.assertEqual(sut.get_edge_size(), 1)
+        self.assertIs(sut.get_edge(0), e1)
+        self.assertEqual(sut.get_number_of_edge(e1), 1)
+        self.assertEqual(sut.get_degree_map(), {0: 1, 1: 1})
+
+        sut.remove_edge_by_handle(h1)
+        self.assertTrue(sut.is_empty())
+        self.assertEqual(sut.get_node_size(), 0)
+        self.assertEqual(sut.get_degree_map(), {})
+
+    def test_remove_self_loop(self):
+        # 自己ループの辺を削除する
+        sut = Graph()
+        e1 = Edge(0, 0, Decimal('1'))
+        sut.add_edge(e1)
+        sut.add_edge(Edge(0, 1, Decimal('1')))
+        self.assertEqual(sut.get_degree_map(), {0: 3, 1: 1})
+
+        sut.remove_edge(e1)
+        self.assertEqual(sut.get_degree_map(), {0: 1, 1: 1})
+        self.assertEqual(sut.get_edge_list_by_node(0), [Edge(0, 1, Decimal('1'))])
+
     def test_get_copy_of_nodes(self):
         # ノード一覧を返す
         sut = Graph()
@@ -230,6 +321,27 @@ class GraphTest(unittest.TestCase):
         g.add_edge(e4)
         self.assertFalse(sut.contains_graph(g))
 
+    def test_contains_graph_multiplicity(self):
+        # 同じ辺の数も含んでいるかを判定する
+        sut = Graph()
+        g   = Graph()
+        e1 = Edge(1, 2, Decimal('10'))
+        e2 = Edge(2, 3, Decimal('10'))
+        sut.add_edge(e1)
+        sut.add_edge(e2)
+        sut.add_edge(Edge(2, 1, Decimal('10')))
+        g.add_edge(e1)
+        g.add_edge(e1)
+        self.assertTrue(sut.contains_graph(g))
+
+        g.add_edge(e1)
+        self.assertFalse(sut.contains_graph(g))
+        self.assertFalse(sut == g)
+
+        g.remove_edge(e1)
+        g.add_edge(e2)
+        self.assertTrue(sut == g)
+
     def test_total_cost(self):
         # 総コストを返す
         sut = Graph()
@@ -452,6 +564,22 @@ class GraphTest(unittest.TestCase):
         self.assertEqual(degree_map[2], 2)
         self.assertEqual(degree_map[3], 1)
 
+    def test_degree_map_order(self):
+        # 次数マップのノードは現在の辺の並びで最初に現れる順になる
+        sut = Graph()
+        e1 = Edge(0, 1, Decimal('10'))
+        sut.add_edge(e1)
+        sut.add_edge(Edge(2, 3, Decimal('11')))
+        sut.add_edge(Edge(1, 2, Decimal('12')))
+        self.assertEqual(list(sut.get_degree_map()), [0, 1, 2, 3])
+
+        sut.remove_edge(e1)
+        self.assertEqual(list(sut.get_degree_map()), [2, 3, 1])
+        self.assertEqual(sorted(sut.get_degree_map(), key=sut.get_node_position), [2, 3, 1])
+
+        sut.add_edge(e1)
+        self.assertEqual(list(sut.get_degree_map()), [2, 3, 1, 0])
+
     def test_is_same(self):
         # 同じ辺のリストの比較
         edges1 = []
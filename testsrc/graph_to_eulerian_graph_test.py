@@ -3,10 +3,15 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import unittest
+import random
 from decimal import Decimal
 from edge import Edge
 from alias_graph import AliasGraph
 import graph_to_eulerian_graph
+import matching
+import dijkstra
+from search_graph import SearchGraph
+from distance_table import DistanceTable
 
 class GraphToEulerianGraphTest(unittest.TestCase):
     def test_make_complete_graph(self):
@@ -59,6 +64,29 @@ class GraphToEulerianGraphTest(unittest.TestCase):
         graph_to_eulerian_graph.add_matching_to_graph(ext_graph, org_graph)
         self.assertEqual(org_graph, exp_graph)
 
+    def test_add_matching_to_graph_distance_table(self):
+        # 最小コストの表の経路を使っても同じ辺を追加する
+        org_graph = AliasGraph()
+        org_graph.add_edge(Edge(0, 1, Decimal('10')))
+        org_graph.add_edge(Edge(0, 2, Decimal('8')))
+        org_graph.add_edge(Edge(1, 2, Decimal('9')))
+        org_graph.add_edge(Edge(2, 3, Decimal('7')))
+        org_graph.add_edge(Edge(3, 4, Decimal('1')))
+        org_graph.add_edge(Edge(3, 5, Decimal('3')))
+        org_graph.add_edge(Edge(3, 6, Decimal('5')))
+        org_graph.add_edge(Edge(4, 7, Decimal('2')))
+        org_graph.add_edge(Edge(5, 7, Decimal('6')))
+        org_graph.add_edge(Edge(6, 7, Decimal('4')))
+        ext_graph = AliasGraph()
+        ext_graph.add_edge(Edge(7, 2, Decimal('1')))
+        ext_graph.add_edge(Edge(0, 1, Decimal('1')))
+        exp_graph = AliasGraph.copy_instance(org_graph)
+        graph_to_eulerian_graph.add_matching_to_graph(ext_graph, exp_graph)
+        table = DistanceTable(SearchGraph(org_graph), [0, 1, 2, 7])
+        graph_to_eulerian_graph.add_matching_to_graph(ext_graph, org_graph, distance_table=table)
+        self.assertEqual(org_graph, exp_graph)
+        self.assertEqual(org_graph.get_edge_size(), 14)
+
     def test_make_euler_graph(self):
         # オイラーグラフを作成する
         org_graph = AliasGraph()
@@ -79,6 +107,29 @@ class GraphToEulerianGraphTest(unittest.TestCase):
         graph_to_eulerian_graph.make_euler_graph(org_graph)
         self.assertEqual(org_graph, exp_graph)
 
+    def test_match_nearest_odd_nodes(self):
+        # 近傍ノードから始めても完全グラフと同じコストのマッチングを返す
+        rng = random.Random(1)
+        for _ in range(20):
+            n = rng.randrange(6, 40)
+            graph = AliasGraph()
+            for i in range(1, n):
+                graph.add_edge(Edge(rng.randrange(i), i, Decimal(rng.randrange(1, 50)) / 10))
+            for _ in range(n // 2):
+                u, v = rng.sample(range(n), 2)
+                graph.add_edge(Edge(u, v, Decimal(rng.randrange(1, 50))))
+            nodes = graph_to_eulerian_graph.get_odd_degree_nodes(graph)
+            search_graph = SearchGraph(graph)
+            exp = matching.blossom(graph_to_eulerian_graph.make_complete_graph(nodes, graph, search_graph))
+            for k in (1, 3):
+                act = graph_to_eulerian_graph.match_nearest_odd_nodes(nodes, search_graph, k)
+                self.assertEqual(act.get_edge_size(), len(nodes) // 2)
+                self.assertEqual(self.matching_cost(act, search_graph), self.matching_cost(exp, search_graph))
+
+    @staticmethod
+    def matching_cost(m: AliasGraph, search_graph: SearchGraph) -> Decimal:
+        return sum((dijkstra.get_shortest_length(search_graph, e.get_node1(), e.get_node2()) for e in m.edge_generator()), Decimal(0))
+
     def test_restore_branch_with_duplicating(self):
         # 枝線を複製しながらマージする
         sut = AliasGraph()
@@ -94,6 +145,23 @@ class GraphToEulerianGraphTest(unittest.TestCase):
         self.assertEqual(sut.get_real_node_size(), 5)
         self.assertEqual(sut.get_edge_size(), 5)
 
+    def test_cut_extra_route(self):
+        # 初期データより多い同じ辺を偶数本ずつ、先に追加されたものから削除する
+        e1 = Edge(0, 1, Decimal('1'))
+        e2 = Edge(1, 2, Decimal('2'))
+        e3 = Edge(2, 0, Decimal('3'))
+        initial_graph = AliasGraph()
+        for e in (e1, e2, e3):
+            initial_graph.add_edge(e)
+        graph = AliasGraph()
+        for e in (e1, e2, e1, e3, e2, e1, Edge(1, 0, Decimal('1')), e2):
+            graph.add_edge(e)
+        graph_to_eulerian_graph.cut_extra_route(graph, initial_graph)
+        self.assertEqual(graph.get_number_of_edge(e1), 2)
+        self.assertEqual(graph.get_number_of_edge(e2), 1)
+        self.assertEqual(graph.get_number_of_edge(e3), 1)
+        self.assertEqual(list(graph.edge_generator()), [e3, e1, Edge(1, 0, Decimal('1')), e2])
+
     def test_graph_to_eulerian_graph(self):
         # オイラーグラフを生成する
         g = AliasGraph()
@@ -111,3 +179,16 @@ class GraphToEulerianGraphTest(unittest.TestCase):
         self.assertEqual(act.get_number_of_edge(e1), 2)
         self.assertEqual(act.get_number_of_edge(e2), 2)
         self.assertEqual(act.get_number_of_edge(e5), 2)
+
+    def test_graph_to_eulerian_graph_nearest(self):
+        # 近傍ノードからマッチングを始めても同じオイラーグラフを生成する
+        g = AliasGraph()
+        g.add_edge(Edge(0, 4, Decimal('0.1')))
+        g.add_edge(Edge(1, 4, Decimal('0.2')))
+        g.add_edge(Edge(0, 3, Decimal('0.3')))
+        g.add_edge(Edge(1, 3, Decimal('0.4')))
+        g.add_edge(Edge(2, 3, Decimal('0.5')))
+        g.add_edge(Edge(0, 1, Decimal('0.6')))
+        exp = graph_to_eulerian_graph.graph_to_eulerian_graph(AliasGraph.copy_instance(g))
+        act = graph_to_eulerian_graph.graph_to_eulerian_graph(g, nearest=1)
+        self.assertEqual(act, exp)
@@ -103,3 +103,12 @@ class MatchingGraphTest(unittest.TestCase):
         sut = MatchingGraph(3)
         self.assertEqual(sut.get_num_vertices(), 3)
         self.assertEqual(sut.get_num_edges(), 0)
+
+    def test_adj_edge_list(self):
+        # 隣接リストと同じ順で辺のインデックスを返す
+        sut = MatchingGraph(3)
+        sut.add_edge(0, 1)
+        sut.add_edge(1, 2)
+        self.assertEqual(sut.get_adj_list(1), [0, 2])
+        self.assertEqual(sut.get_adj_edge_list(1), [0, 1])
+        self.assertEqual(sut.get_adj_edge_list(2), [1])
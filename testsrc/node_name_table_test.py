@@ -0,0 +1,50 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import unittest
+from node_name_table import NodeNameTable
+
+class NodeNameTableTest(unittest.TestCase):
+    def test_add(self):
+        # 登録順にIDが振られる
+        t = NodeNameTable()
+        self.assertEqual(t.add('零'), 0)
+        self.assertEqual(t.add('壱'), 1)
+        self.assertEqual(t.add('弐'), 2)
+        self.assertEqual(len(t), 3)
+        self.assertEqual(list(t), ['零', '壱', '弐'])
+
+    def test_add_duplicate(self):
+        # 登録済みの名前は既存のIDを返し、追加しない
+        t = NodeNameTable()
+        t.add('零')
+        t.add('壱')
+        self.assertEqual(t.add('零'), 0)
+        self.assertEqual(len(t), 2)
+
+    def test_index(self):
+        # 名前からIDを引く
+        t = NodeNameTable()
+        t.add('零')
+        t.add('壱')
+        self.assertEqual(t.index('壱'), 1)
+        self.assertEqual(t[1], '壱')
+        self.assertIn('零', t)
+        self.assertNotIn('弐', t)
+
+    def test_index_not_found(self):
+        # 登録されていない名前はValueError
+        t = NodeNameTable()
+        t.add('零')
+        with self.assertRaises(ValueError):
+            t.index('弐')
+
+    def test_append_duplicate(self):
+        # 同名を追加してもIDは最初のものを返す
+        t = NodeNameTable()
+        t.add('1')
+        t.append('1')
+        self.assertEqual(len(t), 2)
+        self.assertEqual(t[1], '1')
+        self.assertEqual(t.index('1'), 0)
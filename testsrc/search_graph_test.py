@@ -0,0 +1,55 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import unittest
+import pickle
+from decimal import Decimal
+from edge import Edge
+from alias_graph import AliasGraph
+from search_graph import SearchGraph
+
+class SearchGraphTest(unittest.TestCase):
+    def test_build(self):
+        # ノードは辺に初めて現れた順に登録される
+        g = AliasGraph()
+        g.add_edge(Edge(2, 0, Decimal('1')))
+        g.add_edge(Edge(0, 1, Decimal('2')))
+        sg = SearchGraph(g)
+        self.assertEqual(list(sg.node_iterator()), [2, 0, 1])
+        self.assertEqual(len(sg), 3)
+        self.assertEqual(sg.get_edge_list(0), [Edge(2, 0, Decimal('1')), Edge(0, 1, Decimal('2'))])
+
+    def test_build_alias(self):
+        # エイリアスを解決して登録する
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        g.add_edge(Edge(2, 3, Decimal('1')))
+        g.set_alias_node(1, 4)
+        g.set_alias_node(2, 4)
+        sg = SearchGraph(g)
+        self.assertTrue(sg.contains_node(4))
+        self.assertFalse(sg.contains_node(1))
+        self.assertEqual(sg.get_edge_list(4), [Edge(0, 4, Decimal('1')), Edge(4, 3, Decimal('1'))])
+
+    def test_independent_of_source(self):
+        # 構築後に元のグラフを変更しても影響しない
+        g = AliasGraph()
+        g.add_edge(Edge(0, 1, Decimal('1')))
+        sg = SearchGraph(g)
+        g.add_edge(Edge(1, 2, Decimal('1')))
+        self.assertFalse(sg.contains_node(2))
+        self.assertEqual(len(sg.get_edge_list(1)), 1)
+
+    def test_pickle(self):
+        # 辺のタプルから同じ順序で再構築する
+        g = AliasGraph()
+        g.add_edge(Edge(2, 0, Decimal('1')))
+        g.add_edge(Edge(0, 1, Decimal('2')))
+        g.add_edge(Edge(3, 1, Decimal('0.5')))
+        g.set_alias_node(3, 4)
+        sg = SearchGraph(g)
+        act = pickle.loads(pickle.dumps(sg))
+        self.assertEqual(list(act.node_iterator()), list(sg.node_iterator()))
+        for n in sg.node_iterator():
+            self.assertEqual(act.get_edge_list(n), sg.get_edge_list(n))
@@ -0,0 +1,47 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import unittest
+from union_find import UnionFind
+
+class UnionFindTest(unittest.TestCase):
+    def test_find_new(self):
+        # 未登録の要素は自身が代表元になる
+        uf = UnionFind()
+        self.assertEqual(uf.find(3), 3)
+        self.assertEqual(uf.get_set_size(), 1)
+
+    def test_union(self):
+        # 併合した要素は同じ集合に属する
+        uf = UnionFind()
+        uf.union(0, 1)
+        uf.union(2, 3)
+        self.assertTrue(uf.same(0, 1))
+        self.assertTrue(uf.same(2, 3))
+        self.assertFalse(uf.same(1, 2))
+        self.assertEqual(uf.get_set_size(), 2)
+
+    def test_union_transitive(self):
+        # 併合は推移的
+        uf = UnionFind()
+        uf.union(0, 1)
+        uf.union(2, 3)
+        uf.union(1, 3)
+        self.assertTrue(uf.same(0, 2))
+        self.assertEqual(uf.get_set_size(), 1)
+
+    def test_union_same_set(self):
+        # 同じ集合の併合では何も変わらない
+        uf = UnionFind()
+        root = uf.union(0, 1)
+        self.assertEqual(uf.union(1, 0), root)
+        self.assertEqual(uf.get_set_size(), 1)
+
+    def test_iter(self):
+        # 要素を登録順に返す
+        uf = UnionFind()
+        uf.union(3, 1)
+        uf.find(0)
+        uf.union(1, 2)
+        self.assertEqual(list(uf), [3, 1, 0, 2])
@@ -0,0 +1,58 @@
+from collections.abc import Iterator
+
+## ノードの集合を管理する素集合データ構造(Union-Find)。
+#  経路圧縮とサイズによる併合を行う。
+#  要素は初めてfind()またはunion()に渡されたときに単独の集合として登録される。
+class UnionFind:
+    def __init__(self):
+        self.parent: dict[int, int] = dict()  # 要素 -> 親要素
+        self.size: dict[int, int] = dict()  # 代表元 -> 集合の要素数
+
+    ## 要素の代表元を返す。
+    #  @param x 要素。
+    #  @return xが属する集合の代表元。
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+            return x
+
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    ## 2つの要素が属する集合を併合する。
+    #  @param x 要素。
+    #  @param y 要素。
+    #  @return 併合後の代表元。
+    def union(self, x: int, y: int) -> int:
+        root_x = self.find(x)
+        root_y = self.find(y)
+        if root_x == root_y:
+            return root_x
+        if self.size[root_x] < self.size[root_y]:
+            root_x, root_y = root_y, root_x
+        self.parent[root_y] = root_x
+        self.size[root_x] += self.size.pop(root_y)
+        return root_x
+
+    ## 2つの要素が同じ集合に属するときTrueを返す。
+    #  @param x 要素。
+    #  @param y 要素。
+    #  @return 同じ集合に属するときTrue。
+    def same(self, x: int, y: int) -> bool:
+        return self.find(x) == self.find(y)
+
+    ## 集合の数を返す。
+    #  @return 集合の数。
+    def get_set_size(self) -> int:
+        return len(self.size)
+
+    ## 登録された要素のイテレータを返す。
+    #  @return 要素が登録された順のイテレータ。
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.parent)